@@ -1,49 +1,189 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, g, request, jsonify, stream_with_context
 from flask_cors import CORS
-import openai
 import os
 import json
+import base64
+import html
 import re
-from datetime import datetime
-import sqlite3
-from dotenv import load_dotenv
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from concurrent.futures import ThreadPoolExecutor, wait
+from functools import wraps
 
-load_dotenv()
+# Load .env before importing modules that read their settings at import time.
+# Deployments set real environment variables, so skip importing dotenv there.
+DOTENV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.env')
+if os.path.exists(DOTENV_PATH):
+    from dotenv import load_dotenv
+    load_dotenv(DOTENV_PATH)
+
+import llm_client
+import metrics
+import storage
+import question_bank
+import jd_compact
+import evaluation_jobs
+import session_export
+from llm_cache import LLMCache, make_key, normalize_text
+from jd_index import JDIndex, questions_key
+from fallback import (
+    get_fallback_skills, generate_fallback_questions, fallback_question_pool,
+    generate_fallback_evaluation, generate_fallback_evaluations
+)
+from json_stream import StreamingJSONParser
 
 app = Flask(__name__)
 CORS(app)
 
-# Configure OpenAI
-openai.api_key = os.getenv('OPENAI_API_KEY')
+# Cache for skill extraction and question generation responses
+llm_cache = LLMCache(
+    storage.connection,
+    max_entries=int(os.getenv('LLM_CACHE_MAX_ENTRIES', 1024)),
+    ttl_seconds=int(os.getenv('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+)
+
+# Near-duplicate job descriptions reuse (above JD_MATCH_THRESHOLD) or seed
+# (above JD_SEED_THRESHOLD) the skills and questions extracted for earlier ones
+jd_index = JDIndex(
+    threshold=float(os.getenv('JD_MATCH_THRESHOLD', 0.8)),
+    seed_threshold=float(os.getenv('JD_SEED_THRESHOLD', 0.6))
+)
+
+# Background answer evaluation; jobs persist in SQLite and are evaluated by
+# EVALUATION_JOB_WORKERS threads, with retries before the fallback score
+evaluation_queue = evaluation_jobs.JobQueue(
+    evaluate=lambda question, answer, job_context: _evaluate_with_model(question, answer, job_context),
+    fallback=lambda question, answer, error: _evaluation_job_fallback(question, answer, error),
+    workers=int(os.getenv('EVALUATION_JOB_WORKERS', 4)),
+    max_attempts=int(os.getenv('EVALUATION_JOB_MAX_ATTEMPTS', 3)),
+    retry_delay=float(os.getenv('EVALUATION_JOB_RETRY_DELAY_SECONDS', 2))
+)
+# Longest a GET /api/evaluation-jobs/<id>?wait= request may block
+MAX_JOB_WAIT_SECONDS = float(os.getenv('EVALUATION_JOB_MAX_WAIT_SECONDS', 30))
+
+# Seconds a request waits for the background schema setup before answering 503
+DB_INIT_TIMEOUT_SECONDS = float(os.getenv('DB_INIT_TIMEOUT_SECONDS', 30))
+
+_db_ready = threading.Event()
+_db_init_lock = threading.Lock()
+_db_init_state = {'status': 'pending', 'started': False}
 
 # Database setup
 def init_db():
-    conn = sqlite3.connect('interview_prep.db')
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sessions (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            job_description TEXT,
-            questions TEXT,
-            answers TEXT,
-            scores TEXT,
-            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    """Create or migrate tables and load the similarity index; safe to run repeatedly"""
+    storage.init_db(
+        llm_cache.create_table, question_bank.create_table, jd_index.create_table,
+        evaluation_queue.create_table
+    )
+    jd_index.load()
+    _db_init_state['status'] = 'ready'
+    _db_ready.set()
+
+def start_db_init():
+    """Run init_db on a background thread unless it is already running or done"""
+    with _db_init_lock:
+        if _db_init_state['started']:
+            return
+        _db_init_state['started'] = True
+        _db_init_state['status'] = 'initializing'
+    threading.Thread(target=_init_db_in_background, name='init-db', daemon=True).start()
+
+def _init_db_in_background():
+    try:
+        init_db()
+        evaluation_queue.start()
+    except Exception as e:
+        print(f"Error initializing database: {e}")
+        # Let the next request try again
+        with _db_init_lock:
+            _db_init_state['started'] = False
+            _db_init_state['status'] = 'failed'
+
+@app.cli.command('init-db')
+def init_db_command():
+    """Create or migrate the database schema"""
+    init_db()
+    print(f"Database ready: {storage.DB_PATH}")
+
+# Bounded pool for evaluating a whole session's answers in parallel
+EVALUATION_WORKERS = int(os.getenv('EVALUATION_WORKERS', 8))
+EVALUATION_BATCH_DEADLINE_SECONDS = float(os.getenv('EVALUATION_BATCH_DEADLINE_SECONDS', 30))
+MAX_EVALUATION_BATCH_SIZE = 20
+
+# Token budget for the compacted job description sent by /api/prepare-interview
+JD_TOKEN_BUDGET = int(os.getenv('JD_TOKEN_BUDGET', 1500))
+
+# Serve questions from the bank of previously generated ones when it has coverage
+QUESTION_BANK_ENABLED = os.getenv('QUESTION_BANK_ENABLED', '1').lower() in ('1', 'true', 'yes')
+
+# Every question set has exactly this many questions of each type
+QUESTION_SLOTS = {'technical': question_bank.TECHNICAL_PER_SET, 'behavioral': question_bank.BEHAVIORAL_PER_SET}
+
+# What model-backed routes do when the upstream admission queue is full:
+# 'fallback' serves the rule-based result, 'reject' answers 503 straight away
+OVERLOAD_POLICY = os.getenv('LLM_OVERLOAD_POLICY', 'fallback').lower()
 
-init_db()
+DEFAULT_SESSIONS_PAGE_SIZE = 20
+MAX_SESSIONS_PAGE_SIZE = 100
+DEFAULT_EXPORT_BATCH_SIZE = 500
+MAX_EXPORT_BATCH_SIZE = 5000
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', session_export.ndjson),
+    'csv': ('text/csv', session_export.csv_rows)
+}
+evaluation_pool = ThreadPoolExecutor(max_workers=EVALUATION_WORKERS, thread_name_prefix='evaluate')
 
 def extract_skills_from_job_description(job_description):
     """Extract key skills and competencies from job description using AI"""
+    key = make_key('skills', normalize_text(job_description))
+    try:
+        return llm_cache.get_or_compute(key, lambda: _extract_skills_with_index(job_description))
+    except Exception as e:
+        print(f"Error extracting skills: {e}")
+        _record_fallback('skills', e)
+        return get_fallback_skills(job_description)
+
+def _record_fallback(helper, error):
+    """Count a fallback result, and whether unparseable model JSON caused it"""
+    metrics.FALLBACKS.inc(helper=helper)
+    if isinstance(error, json.JSONDecodeError):
+        metrics.JSON_PARSE_FAILURES.inc(helper=helper)
+
+def _lookup_similar(job_description):
+    """Find a near-duplicate job description; returns (match, signature)"""
+    try:
+        return jd_index.lookup(job_description)
+    except Exception as e:
+        print(f"Error searching job description index: {e}")
+        return None, None
+
+def _index_job_description(job_description, signature, skills):
+    """Add a job description to the similarity index; returns its entry id"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert HR analyst and technical recruiter. Extract ALL relevant skills, technologies, competencies, and requirements from the job description.
+        return jd_index.add(job_description, signature, skills)
+    except Exception as e:
+        print(f"Error updating job description index: {e}")
+        return None
+
+def _extract_skills_with_index(job_description):
+    """Reuse the skills of a near-duplicate description, or extract them seeded by a similar one"""
+    match, signature = _lookup_similar(job_description)
+    if match is not None and match.similarity >= jd_index.threshold:
+        return match.skills
+    skills = _extract_skills_with_model(job_description, seed_skills=match.skills if match else None)
+    _index_job_description(job_description, signature, skills)
+    return skills
+
+def _skills_messages(job_description, seed_skills=None):
+    """Build the chat messages for skill extraction"""
+    user_content = f"Extract ALL skills from this job description: {job_description}"
+    if seed_skills:
+        user_content += f"\nSkills extracted from a similar job description (keep those that still apply): {', '.join(seed_skills)}"
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert HR analyst and technical recruiter. Extract ALL relevant skills, technologies, competencies, and requirements from the job description.
 
 Return a comprehensive JSON array of skills including:
 - Technical skills (programming languages, frameworks, tools, platforms)
@@ -54,202 +194,288 @@ Return a comprehensive JSON array of skills including:
 - Tools and technologies mentioned
 
 Be thorough and extract 15-25 skills. Return ONLY a valid JSON array like: ["skill1", "skill2", "skill3"]"""
-                },
-                {
-                    "role": "user",
-                    "content": f"Extract ALL skills from this job description: {job_description}"
-                }
-            ],
-            max_tokens=800,
-            temperature=0.3
-        )
-        
-        skills_text = response.choices[0].message.content
-        # Clean and parse the response
-        skills_text = re.sub(r'```json\s*|\s*```', '', skills_text)
-        skills_text = skills_text.strip()
-        
-        # Handle cases where the response might not be valid JSON
-        try:
-            skills = json.loads(skills_text)
-            if isinstance(skills, list):
-                return skills
-            else:
-                raise ValueError("Response is not a list")
-        except (json.JSONDecodeError, ValueError):
-            # If JSON parsing fails, try to extract skills manually
-            skills_text = re.sub(r'[\[\]"]', '', skills_text)
-            skills = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
-            return skills if skills else get_fallback_skills(job_description)
-            
-    except Exception as e:
-        print(f"Error extracting skills: {e}")
-        return get_fallback_skills(job_description)
+        },
+        {
+            "role": "user",
+            "content": user_content
+        }
+    ]
 
-def get_fallback_skills(job_description):
-    """Enhanced fallback skill extraction"""
-    job_lower = job_description.lower()
-    skills = []
-    
-    # Technical skills
-    tech_skills = {
-        'python': ['python', 'django', 'flask', 'pandas', 'numpy', 'scikit-learn'],
-        'javascript': ['javascript', 'js', 'node.js', 'react', 'angular', 'vue', 'typescript'],
-        'java': ['java', 'spring', 'hibernate', 'maven', 'gradle'],
-        'c#': ['c#', '.net', 'asp.net', 'entity framework'],
-        'sql': ['sql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'database'],
-        'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'cloud'],
-        'azure': ['azure', 'microsoft azure', 'cloud'],
-        'docker': ['docker', 'containerization', 'kubernetes', 'k8s'],
-        'git': ['git', 'github', 'gitlab', 'version control'],
-        'agile': ['agile', 'scrum', 'kanban', 'sprint', 'sprint planning'],
-        'ci/cd': ['ci/cd', 'jenkins', 'github actions', 'gitlab ci', 'pipeline'],
-        'machine learning': ['machine learning', 'ml', 'ai', 'artificial intelligence', 'deep learning'],
-        'data science': ['data science', 'data analysis', 'statistics', 'analytics'],
-        'devops': ['devops', 'deployment', 'infrastructure', 'terraform', 'ansible'],
-        'frontend': ['html', 'css', 'bootstrap', 'tailwind', 'responsive design'],
-        'backend': ['api', 'rest', 'graphql', 'microservices', 'server-side'],
-        'mobile': ['ios', 'android', 'react native', 'flutter', 'mobile development'],
-        'testing': ['testing', 'unit testing', 'integration testing', 'qa', 'quality assurance']
-    }
-    
-    # Extract technical skills
-    for category, keywords in tech_skills.items():
-        if any(keyword in job_lower for keyword in keywords):
-            skills.append(category.title())
-    
-    # Soft skills
-    soft_skills = {
-        'communication': ['communication', 'verbal', 'written', 'presentation'],
-        'leadership': ['leadership', 'lead', 'manage', 'management', 'team lead'],
-        'teamwork': ['teamwork', 'collaboration', 'team player', 'cross-functional'],
-        'problem solving': ['problem solving', 'analytical', 'critical thinking', 'troubleshooting'],
-        'time management': ['time management', 'prioritization', 'deadline'],
-        'adaptability': ['adaptability', 'flexible', 'learning', 'quick learner'],
-        'attention to detail': ['attention to detail', 'detail-oriented', 'accuracy'],
-        'creativity': ['creativity', 'innovative', 'creative thinking'],
-        'customer service': ['customer service', 'client-facing', 'stakeholder'],
-        'project management': ['project management', 'planning', 'coordination']
-    }
+def _extract_skills_with_model(job_description, seed_skills=None):
+    """Call the model for skills; raises if no usable skills come back"""
+    skills_text = llm_client.chat_completion(
+        messages=_skills_messages(job_description, seed_skills),
+        max_tokens=800,
+        temperature=0.3,
+        helper='skills'
+    )
     
-    # Extract soft skills
-    for skill, keywords in soft_skills.items():
-        if any(keyword in job_lower for keyword in keywords):
-            skills.append(skill.title())
+    # Clean and parse the response
+    skills_text = re.sub(r'```json\s*|\s*```', '', skills_text)
+    skills_text = skills_text.strip()
     
-    # Experience levels
-    experience_keywords = ['junior', 'senior', 'lead', 'principal', 'architect', 'entry-level', 'mid-level']
-    for keyword in experience_keywords:
-        if keyword in job_lower:
-            skills.append(f"{keyword.title()} Level")
-    
-    # Remove duplicates and return
-    return list(set(skills)) if skills else ['General Programming', 'Problem Solving', 'Communication']
+    # Handle cases where the response might not be valid JSON
+    try:
+        skills = json.loads(skills_text)
+        if isinstance(skills, list):
+            return skills
+        else:
+            raise ValueError("Response is not a list")
+    except (json.JSONDecodeError, ValueError):
+        metrics.JSON_PARSE_FAILURES.inc(helper='skills')
+        # If JSON parsing fails, try to extract skills manually
+        skills_text = re.sub(r'[\[\]"]', '', skills_text)
+        skills = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
+        if not skills:
+            raise ValueError("No skills found in model response")
+        return skills
 
 def generate_interview_questions(job_description, skills, difficulty_level="intermediate"):
     """Generate personalized interview questions based on job description and skills"""
+    key = _questions_cache_key(job_description, skills, difficulty_level)
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": f"""You are an expert technical interviewer. Generate 5 personalized interview questions based on the job description and skills.
-                    
-                    Requirements:
-                    - Questions should be {difficulty_level} level
-                    - Mix of technical and behavioral questions (3 technical, 2 behavioral)
-                    - Directly relevant to the job requirements and extracted skills
-                    - Include scenario-based questions
-                    - Make questions specific to the technologies and skills mentioned
-                    - Return as JSON array with structure: [{{"question": "...", "type": "technical|behavioral", "skill": "..."}}]
-                    """
-                },
-                {
-                    "role": "user",
-                    "content": f"Job Description: {job_description}\nExtracted Skills: {', '.join(skills)}\nGenerate 5 interview questions."
-                }
-            ],
-            max_tokens=1000,
-            temperature=0.7
+        return llm_cache.get_or_compute(
+            key, lambda: _bank_questions(
+                _generate_questions_with_index(job_description, skills, difficulty_level), difficulty_level
+            )
         )
-        
-        questions_text = response.choices[0].message.content
-        questions_text = re.sub(r'```json\s*|\s*```', '', questions_text)
-        questions = json.loads(questions_text)
-        return questions
     except Exception as e:
         print(f"Error generating questions: {e}")
+        _record_fallback('questions', e)
         # Enhanced fallback questions based on skills
         return generate_fallback_questions(skills, difficulty_level)
 
-def generate_fallback_questions(skills, difficulty_level):
-    """Generate fallback questions based on extracted skills"""
-    questions = []
+def _generate_questions_with_index(job_description, skills, difficulty_level):
+    """Reuse questions generated for a near-duplicate description with the same skills"""
+    match, signature = _lookup_similar(job_description)
+    entry_id = None
+    if match is not None and match.similarity >= jd_index.threshold:
+        stored = match.questions.get(questions_key(skills, difficulty_level))
+        if stored:
+            return stored
+        entry_id = match.id
+    questions = _generate_questions_with_model(job_description, skills, difficulty_level)
+    if entry_id is None:
+        entry_id = _index_job_description(job_description, signature, skills)
+    if entry_id is not None:
+        try:
+            jd_index.add_questions(entry_id, skills, difficulty_level, questions)
+        except Exception as e:
+            print(f"Error updating job description index: {e}")
+    return questions
+
+def _bank_questions(questions, difficulty_level):
+    """Add model-generated questions to the question bank and pass them through"""
+    try:
+        question_bank.add_questions(questions, difficulty_level)
+    except Exception as e:
+        print(f"Error saving to question bank: {e}")
+    return questions
+
+def _question_kind(question):
+    """Lowercased type of a usable question item, or None"""
+    if not isinstance(question, dict) or not str(question.get('question') or '').strip():
+        return None
+    kind = str(question.get('type') or '').strip().lower()
+    return kind if kind in QUESTION_SLOTS else None
+
+def _fill_question_slots(questions, candidates, skills):
+    """Top questions up to exactly 3 technical + 2 behavioral from candidates,
+    then from the fallback pool, skipping duplicates; technical ones first.
+    Items come back as {question, type, skill}, plus the bank id if any."""
+    picked = {kind: [] for kind in QUESTION_SLOTS}
+    seen = set()
+    for question in [*questions, *candidates, *fallback_question_pool(skills)]:
+        kind = _question_kind(question)
+        if kind is None:
+            continue
+        text = normalize_text(str(question['question']))
+        if text in seen or len(picked[kind]) >= QUESTION_SLOTS[kind]:
+            continue
+        item = {
+            'question': str(question['question']).strip(),
+            'type': kind,
+            'skill': str(question.get('skill') or 'General').strip()
+        }
+        if 'id' in question:
+            item['id'] = question['id']
+        picked[kind].append(item)
+        seen.add(text)
+    return picked['technical'] + picked['behavioral']
+
+def assemble_interview_questions(job_description, skills, difficulty_level="intermediate"):
+    """Serve a 3 technical + 2 behavioral set from the question bank, calling the
+    model for the skills it lacks only when the bank cannot fill every slot"""
+    if not QUESTION_BANK_ENABLED:
+        return generate_interview_questions(job_description, skills, difficulty_level)
+    try:
+        banked, uncovered = question_bank.pick_questions(skills, difficulty_level)
+    except Exception as e:
+        print(f"Error reading question bank: {e}")
+        banked, uncovered = [], list(skills)
     
-    # Technical questions based on skills
-    tech_questions = {
-        'python': "Can you explain the difference between lists and tuples in Python, and when would you use each?",
-        'javascript': "How does JavaScript handle asynchronous operations, and what are the different ways to work with async code?",
-        'react': "Explain the concept of React hooks and how they differ from class components.",
-        'sql': "How would you optimize a slow-performing SQL query? Walk me through your approach.",
-        'aws': "Describe the key AWS services you've worked with and how you would architect a scalable web application.",
-        'docker': "Explain the benefits of containerization and how Docker differs from traditional virtualization.",
-        'machine learning': "Walk me through the steps you would take to build and deploy a machine learning model.",
-        'api': "How would you design a RESTful API? What are the key principles you would follow?",
-        'testing': "What testing strategies do you use to ensure code quality? How do you approach unit vs integration testing?"
-    }
+    questions = list(banked)
+    missing = {kind: count - sum(q['type'] == kind for q in questions) for kind, count in QUESTION_SLOTS.items()}
+    if any(count > 0 for count in missing.values()):
+        generated = generate_interview_questions(job_description, uncovered or skills, difficulty_level)
+        questions = _fill_question_slots(questions, generated, skills)
     
-    # Behavioral questions
-    behavioral_questions = [
-        "Tell me about a challenging technical problem you solved recently. What was your approach?",
-        "Describe a situation where you had to work with a difficult team member. How did you handle it?",
-        "How do you stay updated with the latest technologies and industry trends?",
-        "Tell me about a project where you had to learn a new technology quickly. How did you approach it?",
-        "Describe a time when you had to explain a complex technical concept to a non-technical stakeholder."
+    try:
+        question_bank.mark_served([q['id'] for q in questions if 'id' in q])
+    except Exception as e:
+        print(f"Error updating question bank: {e}")
+    return [{k: v for k, v in q.items() if k != 'id'} for q in questions]
+
+def _questions_cache_key(job_description, skills, difficulty_level):
+    """Cache key for generated questions"""
+    return make_key(
+        'questions',
+        normalize_text(job_description),
+        sorted(normalize_text(str(skill)) for skill in skills),
+        normalize_text(difficulty_level)
+    )
+
+def _question_messages(job_description, skills, difficulty_level):
+    """Build the chat messages for question generation"""
+    return [
+        {
+            "role": "system",
+            "content": f"""You are an expert technical interviewer. Generate 5 personalized interview questions based on the job description and skills.
+            
+            Requirements:
+            - Questions should be {difficulty_level} level
+            - Mix of technical and behavioral questions (3 technical, 2 behavioral)
+            - Directly relevant to the job requirements and extracted skills
+            - Include scenario-based questions
+            - Make questions specific to the technologies and skills mentioned
+            - Return as JSON array with structure: [{{"question": "...", "type": "technical|behavioral", "skill": "..."}}]
+            """
+        },
+        {
+            "role": "user",
+            "content": f"Job Description: {job_description}\nExtracted Skills: {', '.join(skills)}\nGenerate 5 interview questions."
+        }
     ]
+
+def _generate_questions_with_model(job_description, skills, difficulty_level):
+    """Call the model for questions; raises if the response is not a JSON list"""
+    questions_text = llm_client.chat_completion(
+        messages=_question_messages(job_description, skills, difficulty_level),
+        max_tokens=1000,
+        temperature=0.7,
+        helper='questions'
+    )
     
-    # Add technical questions based on skills
-    tech_count = 0
-    for skill in skills:
-        skill_lower = skill.lower()
-        for tech_skill, question in tech_questions.items():
-            if tech_skill in skill_lower and tech_count < 3:
-                questions.append({
-                    "question": question,
-                    "type": "technical",
-                    "skill": skill
-                })
-                tech_count += 1
-                break
+    questions_text = re.sub(r'```json\s*|\s*```', '', questions_text)
+    questions = json.loads(questions_text)
+    if not isinstance(questions, list):
+        raise ValueError("Response is not a list")
+    return questions
+
+def prepare_interview(job_description, difficulty_level="intermediate"):
+    """Extract skills and generate questions in one model call on a compacted
+    job description. Returns (skills, questions, metadata)."""
+    compacted = jd_compact.compact(job_description, JD_TOKEN_BUDGET)
+    key = make_key('prepare', normalize_text(job_description), normalize_text(difficulty_level))
+    computed = []
     
-    # Add behavioral questions
-    for i, question in enumerate(behavioral_questions[:2]):
-        questions.append({
-            "question": question,
-            "type": "behavioral",
-            "skill": "Problem Solving" if i == 0 else "Communication"
-        })
+    def compute():
+        computed.append(True)
+        return _prepare_with_model(job_description, compacted, difficulty_level)
     
-    # Ensure we have 5 questions
-    while len(questions) < 5:
-        questions.append({
-            "question": "Can you describe your experience with the technologies mentioned in this role?",
-            "type": "technical",
-            "skill": "General"
-        })
+    try:
+        result = llm_cache.get_or_compute(key, compute)
+        skills, questions, fallback = result['skills'], result['questions'], False
+    except Exception as e:
+        print(f"Error preparing interview: {e}")
+        _record_fallback('prepare', e)
+        skills = get_fallback_skills(job_description)
+        questions = generate_fallback_questions(skills, difficulty_level)
+        fallback = True
+    
+    prompt_tokens = _estimate_prompt_tokens(_prepare_messages(compacted, difficulty_level))
+    baseline_tokens = (
+        _estimate_prompt_tokens(_skills_messages(job_description))
+        + _estimate_prompt_tokens(_question_messages(job_description, skills, difficulty_level))
+    )
+    metadata = {
+        'job_description_tokens': jd_compact.estimate_tokens(job_description),
+        'compacted_tokens': jd_compact.estimate_tokens(compacted),
+        'prompt_tokens': prompt_tokens,
+        'two_call_prompt_tokens': baseline_tokens,
+        'tokens_saved': baseline_tokens - prompt_tokens,
+        'cached': not computed and not fallback,
+        'fallback': fallback
+    }
+    return skills, questions, metadata
+
+def _estimate_prompt_tokens(messages):
+    return sum(jd_compact.estimate_tokens(message['content']) for message in messages)
+
+def _prepare_messages(job_description, difficulty_level):
+    """Build the chat messages for combined skill extraction and question generation"""
+    return [
+        {
+            "role": "system",
+            "content": f"""You are an expert technical recruiter and interviewer. From the job description:
+
+1. Extract 15-25 skills: technical skills, soft skills, domain knowledge, certifications, methodologies and tools.
+2. Generate 5 {difficulty_level} level interview questions (3 technical, 2 behavioral) that are specific to the job and those skills, including scenario-based questions.
+
+Return ONLY a valid JSON object with structure:
+{{"skills": ["skill1", "skill2"], "questions": [{{"question": "...", "type": "technical|behavioral", "skill": "..."}}]}}"""
+        },
+        {
+            "role": "user",
+            "content": f"Job Description:\n{job_description}"
+        }
+    ]
+
+def _prepare_with_model(job_description, compacted, difficulty_level):
+    """Call the model once for skills and questions; raises on a malformed response.
+
+    The results also seed the skills and questions caches and the question
+    bank, so the separate endpoints can reuse them."""
+    text = llm_client.chat_completion(
+        messages=_prepare_messages(compacted, difficulty_level),
+        max_tokens=1500,
+        temperature=0.5,
+        helper='prepare'
+    )
     
-    return questions[:5]
+    text = re.sub(r'```json\s*|\s*```', '', text)
+    result = json.loads(text)
+    if not isinstance(result, dict):
+        raise ValueError("Response is not an object")
+    skills, questions = result.get('skills'), result.get('questions')
+    if not isinstance(skills, list) or not skills:
+        raise ValueError("No skills found in model response")
+    if not isinstance(questions, list) or not any(_question_kind(q) for q in questions):
+        raise ValueError("No questions found in model response")
+    # Same shape and 3 technical + 2 behavioral mix as /api/generate-questions
+    questions = _fill_question_slots([], questions, skills)
+    
+    llm_cache.set(make_key('skills', normalize_text(job_description)), skills)
+    llm_cache.set(_questions_cache_key(job_description, skills, difficulty_level), questions)
+    _bank_questions(questions, difficulty_level)
+    return {'skills': skills, 'questions': questions}
 
 def evaluate_answer(question, answer, job_context):
     """Evaluate user's answer using AI with multi-dimensional scoring"""
     try:
-        response = openai.ChatCompletion.create(
-            model="gpt-3.5-turbo",
-            messages=[
-                {
-                    "role": "system",
-                    "content": """You are an expert technical interviewer evaluating a candidate's answer. Provide a detailed, nuanced evaluation with varying scores based on the quality of the response.
+        return _evaluate_with_model(question, answer, job_context)
+    except Exception as e:
+        print(f"Error evaluating answer: {e}")
+        _record_fallback('evaluation', e)
+        # Enhanced fallback evaluation with more dynamic scoring
+        return generate_fallback_evaluation(answer, question)
+
+def _evaluation_messages(question, answer, job_context):
+    """Build the chat messages for answer evaluation"""
+    return [
+        {
+            "role": "system",
+            "content": """You are an expert technical interviewer evaluating a candidate's answer. Provide a detailed, nuanced evaluation with varying scores based on the quality of the response.
 
 Scoring Guidelines:
 - 9-10: Exceptional - Comprehensive, accurate, well-structured, shows deep understanding
@@ -267,100 +493,251 @@ Scoring Dimensions (1-10 scale):
 
 Return JSON with structure:
 {
-    "overall_score": 8.5,
-    "technical_accuracy": 9,
-    "communication_clarity": 8,
-    "depth_of_knowledge": 7,
-    "contextual_understanding": 9,
-    "problem_solving": 8,
-    "feedback": "Detailed constructive feedback...",
-    "strengths": ["strength1", "strength2"],
-    "improvements": ["improvement1", "improvement2"]
+"overall_score": 8.5,
+"technical_accuracy": 9,
+"communication_clarity": 8,
+"depth_of_knowledge": 7,
+"contextual_understanding": 9,
+"problem_solving": 8,
+"feedback": "Detailed constructive feedback...",
+"strengths": ["strength1", "strength2"],
+"improvements": ["improvement1", "improvement2"]
 }
 
 Be strict and realistic in scoring. Don't give high scores for generic or vague answers."""
-                },
-                {
-                    "role": "user",
-                    "content": f"Question: {question}\nAnswer: {answer}\nJob Context: {job_context}\nEvaluate this answer with realistic scoring."
-                }
-            ],
-            max_tokens=800,
-            temperature=0.3
-        )
-        
-        evaluation_text = response.choices[0].message.content
-        evaluation_text = re.sub(r'```json\s*|\s*```', '', evaluation_text)
-        evaluation = json.loads(evaluation_text)
-        return evaluation
-    except Exception as e:
-        print(f"Error evaluating answer: {e}")
-        # Enhanced fallback evaluation with more dynamic scoring
-        return generate_fallback_evaluation(answer, question)
+        },
+        {
+            "role": "user",
+            "content": f"Question: {question}\nAnswer: {answer}\nJob Context: {job_context}\nEvaluate this answer with realistic scoring."
+        }
+    ]
 
-def generate_fallback_evaluation(answer, question):
-    """Generate more dynamic fallback evaluation based on answer quality"""
-    answer_length = len(answer)
-    answer_words = len(answer.split())
-    
-    # Base scoring logic
-    if answer_words < 20:
-        base_score = 3  # Very short answer
-    elif answer_words < 50:
-        base_score = 5  # Short answer
-    elif answer_words < 100:
-        base_score = 6  # Medium answer
-    elif answer_words < 200:
-        base_score = 7  # Good length
-    else:
-        base_score = 8  # Comprehensive answer
-    
-    # Adjust based on content quality indicators
-    quality_indicators = {
-        'technical_terms': len(re.findall(r'\b(api|database|algorithm|framework|library|deployment|testing|debugging|optimization|architecture)\b', answer.lower())),
-        'examples': len(re.findall(r'\b(for example|e\.g\.|such as|like|instance)\b', answer.lower())),
-        'structure': len(re.findall(r'\b(first|second|third|finally|then|next|also|additionally)\b', answer.lower())),
-        'experience': len(re.findall(r'\b(worked|experience|implemented|developed|created|built|designed)\b', answer.lower()))
-    }
+def _evaluate_with_model(question, answer, job_context, deadline=None):
+    """Call the model for an evaluation; raises on any upstream or parse error"""
+    evaluation_text = llm_client.chat_completion(
+        messages=_evaluation_messages(question, answer, job_context),
+        max_tokens=800,
+        temperature=0.3,
+        deadline=deadline,
+        helper='evaluation'
+    )
     
-    # Calculate bonus points
-    bonus = min(2, sum(quality_indicators.values()) * 0.3)
-    final_score = min(10, base_score + bonus)
-    
-    # Generate dimension scores with some variation
-    technical_accuracy = max(1, min(10, final_score + (1 if 'technical' in question.lower() else -1)))
-    communication_clarity = max(1, min(10, final_score + (1 if quality_indicators['structure'] > 0 else -1)))
-    depth_of_knowledge = max(1, min(10, final_score + (1 if quality_indicators['technical_terms'] > 2 else -1)))
-    contextual_understanding = max(1, min(10, final_score + (1 if quality_indicators['experience'] > 0 else -1)))
-    problem_solving = max(1, min(10, final_score + (1 if quality_indicators['examples'] > 0 else -1)))
-    
-    # Generate feedback based on score
-    if final_score >= 8:
-        feedback = "Excellent response! You demonstrated strong technical knowledge and clear communication."
-        strengths = ["Strong technical understanding", "Clear communication", "Good examples provided"]
-        improvements = ["Consider adding more specific technical details"]
-    elif final_score >= 6:
-        feedback = "Good response with room for improvement. Consider adding more specific examples and technical details."
-        strengths = ["Basic understanding shown", "Clear communication"]
-        improvements = ["Add more specific examples", "Include technical details", "Provide more context"]
+    evaluation_text = re.sub(r'```json\s*|\s*```', '', evaluation_text)
+    evaluation = json.loads(evaluation_text)
+    return evaluation
+
+def _evaluation_job_fallback(question, answer, error):
+    """Fallback score for an evaluation job whose retries ran out"""
+    _record_fallback('evaluation', error)
+    return generate_fallback_evaluation(answer, question)
+
+def _evaluate_before(expires_at, question, answer, job_context):
+    """Evaluate with whatever is left of a batch deadline when the item starts"""
+    remaining = expires_at - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("Evaluation batch deadline exceeded")
+    return _evaluate_with_model(question, answer, job_context, deadline=remaining)
+
+def evaluate_answers(items, job_context, deadline=None):
+    """Evaluate (question, answer) pairs concurrently under one overall deadline.
+
+    Items that fail or are still running when the deadline passes are scored
+    together by generate_fallback_evaluations. Results keep the input order.
+    """
+    if deadline is None:
+        deadline = EVALUATION_BATCH_DEADLINE_SECONDS
+    # Each call gets only the remaining budget, so abandoned items free their
+    # limiter slot and pool worker instead of running on past the batch
+    expires_at = time.monotonic() + deadline
+    futures = [
+        evaluation_pool.submit(_evaluate_before, expires_at, question, answer, job_context)
+        for question, answer in items
+    ]
+    done, _ = wait(futures, timeout=deadline)
+
+    evaluations = [None] * len(futures)
+    failed = []
+    for index, future in enumerate(futures):
+        if future not in done:
+            future.cancel()
+            print(f"Error evaluating answer: timed out after {deadline}s")
+            _record_fallback('evaluation', None)
+        elif future.exception() is not None:
+            print(f"Error evaluating answer: {future.exception()}")
+            _record_fallback('evaluation', future.exception())
+        else:
+            evaluations[index] = future.result()
+            continue
+        failed.append(index)
+    for index, evaluation in zip(failed, generate_fallback_evaluations([items[i] for i in failed])):
+        evaluations[index] = evaluation
+    return evaluations
+
+def stream_interview_questions(job_description, skills, difficulty_level="intermediate"):
+    """Yield (event, data) pairs: one 'question' per parsed question, then 'done'.
+
+    The 'done' payload is authoritative; if the model fails part way it carries
+    fallback questions and clients should replace anything shown so far.
+    """
+    key = _questions_cache_key(job_description, skills, difficulty_level)
+    questions = llm_cache.get(key)
+    fallback = False
+    if questions is not None:
+        for index, question in enumerate(questions):
+            yield 'question', {'index': index, 'question': question}
     else:
-        feedback = "This answer needs significant improvement. Consider providing more detailed responses with specific examples."
-        strengths = ["Attempted to answer the question"]
-        improvements = ["Provide more detailed responses", "Include specific examples", "Add technical context", "Structure your answer better"]
-    
-    return {
-        "overall_score": round(final_score, 1),
-        "technical_accuracy": round(technical_accuracy, 1),
-        "communication_clarity": round(communication_clarity, 1),
-        "depth_of_knowledge": round(depth_of_knowledge, 1),
-        "contextual_understanding": round(contextual_understanding, 1),
-        "problem_solving": round(problem_solving, 1),
-        "feedback": feedback,
-        "strengths": strengths,
-        "improvements": improvements
+        parser = StreamingJSONParser()
+        try:
+            deltas = llm_client.stream_chat_completion(
+                _question_messages(job_description, skills, difficulty_level), 1000, 0.7, helper='questions'
+            )
+            for delta in deltas:
+                for question in parser.feed(delta):
+                    if not isinstance(question, dict) or not question.get('question'):
+                        raise ValueError("Question is missing its text")
+                    yield 'question', {'index': len(parser.items) - 1, 'question': question}
+            questions = parser.result()
+            if not isinstance(questions, list) or not questions:
+                raise ValueError("Response is not a list")
+            llm_cache.set(key, _bank_questions(questions, difficulty_level))
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            _record_fallback('questions', e)
+            questions = generate_fallback_questions(skills, difficulty_level)
+            fallback = True
+    yield 'done', {
+        'success': True,
+        'questions': questions,
+        'total_questions': len(questions),
+        'fallback': fallback
     }
 
+def stream_answer_evaluation(question, answer, job_context):
+    """Yield (event, data) pairs: one 'field' per evaluation member, then 'done'"""
+    parser = StreamingJSONParser()
+    fallback = False
+    try:
+        deltas = llm_client.stream_chat_completion(
+            _evaluation_messages(question, answer, job_context), 800, 0.3, helper='evaluation'
+        )
+        for delta in deltas:
+            for member in parser.feed(delta):
+                if parser.container != '{':
+                    raise ValueError("Response is not an object")
+                name, value = member
+                yield 'field', {'name': name, 'value': value}
+        evaluation = parser.result()
+        if not isinstance(evaluation.get('overall_score'), (int, float)):
+            raise ValueError("Evaluation is missing overall_score")
+    except Exception as e:
+        print(f"Error evaluating answer: {e}")
+        _record_fallback('evaluation', e)
+        evaluation = generate_fallback_evaluation(answer, question)
+        fallback = True
+    yield 'done', {'success': True, 'evaluation': evaluation, 'fallback': fallback}
+
+def _wants_stream():
+    """Streaming is opt-in via ?stream=1 or an Accept: text/event-stream header"""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best == 'text/event-stream'
+
+def _event_stream(events):
+    """Wrap (event, data) pairs in a Server-Sent Events response"""
+    def generate():
+        for event, data in events:
+            yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+
+@app.before_request
+def _wait_for_database():
+    """Hold database-backed requests until schema setup has finished"""
+    if request.endpoint in ('health_check', 'metrics_endpoint') or _db_ready.is_set():
+        return None
+    start_db_init()
+    if not _db_ready.wait(DB_INIT_TIMEOUT_SECONDS):
+        response = jsonify({'error': 'Database is initializing, retry shortly'})
+        response.headers['Retry-After'] = '1'
+        return response, 503
+    return None
+
+@app.after_request
+def _observe_request(response):
+    """Record per-route latency; streamed responses are timed to their first byte"""
+    started = g.pop('request_started', None)
+    if started is not None:
+        metrics.HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            route=request.url_rule.rule if request.url_rule else 'unmatched',
+            method=request.method,
+            status=response.status_code
+        )
+    return response
+
+def _collect_runtime_metrics():
+    """Scrape-time gauges and counters for state kept by other modules"""
+    cache = llm_cache.stats()
+    upstream = llm_client.limiter.stats()
+    index = jd_index.stats()
+    collected = [
+        ('llm_cache_lookups_total', 'counter', 'Model response cache lookups', [
+            ({'result': 'hit'}, cache['hits']),
+            ({'result': 'miss'}, cache['misses']),
+            ({'result': 'coalesced'}, cache['coalesced'])
+        ]),
+        ('llm_cache_purged_total', 'counter', 'Expired model response cache rows deleted', [
+            ({}, cache['purged'])
+        ]),
+        ('llm_upstream_calls', 'gauge', 'Model calls holding or waiting for an upstream slot', [
+            ({'state': 'active'}, upstream['active']),
+            ({'state': 'waiting'}, upstream['waiting'])
+        ]),
+        ('llm_upstream_rejected_total', 'counter', 'Model calls turned away by admission control', [
+            ({}, upstream['rejected'])
+        ]),
+        ('llm_circuit_open', 'gauge', '1 while the model circuit breaker is open or probing', [
+            ({}, int(llm_client.breaker.state != 'closed'))
+        ]),
+        ('jd_index_lookups_total', 'counter', 'Near-duplicate job description lookups', [
+            ({'result': 'match'}, index['matches']),
+            ({'result': 'seed'}, index['seeded']),
+            ({'result': 'miss'}, index['lookups'] - index['matches'] - index['seeded'])
+        ])
+    ]
+    if _db_ready.is_set():
+        jobs = evaluation_queue.stats()
+        collected += [
+            ('evaluation_jobs', 'gauge', 'Answer evaluation jobs per status', [
+                ({'status': status}, jobs[status]) for status in ('queued', 'running', 'done')
+            ]),
+            ('evaluation_job_retries_total', 'counter', 'Evaluation job attempts scheduled for retry', [
+                ({}, jobs['retried'])
+            ])
+        ]
+    return collected
+
+metrics.registry.add_collector(_collect_runtime_metrics)
+
+def admission_controlled(view):
+    """Reject model-backed requests up front while the upstream queue is full,
+    when LLM_OVERLOAD_POLICY is 'reject'"""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        if OVERLOAD_POLICY == 'reject' and llm_client.limiter.saturated():
+            return jsonify({'error': 'Server is busy, please retry shortly'}), 503, {'Retry-After': '1'}
+        return view(*args, **kwargs)
+    return wrapper
+
 @app.route('/api/parse-job-description', methods=['POST'])
+@admission_controlled
 def parse_job_description():
     """Parse job description and extract skills"""
     try:
@@ -381,6 +758,7 @@ def parse_job_description():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/generate-questions', methods=['POST'])
+@admission_controlled
 def generate_questions():
     """Generate personalized interview questions"""
     try:
@@ -392,7 +770,10 @@ def generate_questions():
         if not job_description:
             return jsonify({'error': 'Job description is required'}), 400
         
-        questions = generate_interview_questions(job_description, skills, difficulty)
+        if _wants_stream():
+            return _event_stream(stream_interview_questions(job_description, skills, difficulty))
+        
+        questions = assemble_interview_questions(job_description, skills, difficulty)
         
         return jsonify({
             'success': True,
@@ -402,7 +783,32 @@ def generate_questions():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/prepare-interview', methods=['POST'])
+@admission_controlled
+def prepare_interview_endpoint():
+    """Extract skills and generate questions in a single round trip"""
+    try:
+        data = request.get_json()
+        job_description = data.get('job_description', '')
+        difficulty = data.get('difficulty', 'intermediate')
+        
+        if not job_description:
+            return jsonify({'error': 'Job description is required'}), 400
+        
+        skills, questions, metadata = prepare_interview(job_description, difficulty)
+        
+        return jsonify({
+            'success': True,
+            'skills': skills,
+            'questions': questions,
+            'total_questions': len(questions),
+            'metadata': metadata
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/evaluate-answer', methods=['POST'])
+@admission_controlled
 def evaluate_answer_endpoint():
     """Evaluate user's answer to a question"""
     try:
@@ -414,6 +820,9 @@ def evaluate_answer_endpoint():
         if not question or not answer:
             return jsonify({'error': 'Question and answer are required'}), 400
         
+        if _wants_stream():
+            return _event_stream(stream_answer_evaluation(question, answer, job_context))
+        
         evaluation = evaluate_answer(question, answer, job_context)
         
         return jsonify({
@@ -423,25 +832,168 @@ def evaluate_answer_endpoint():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/evaluation-jobs', methods=['POST'])
+def submit_evaluation_job():
+    """Queue an answer for evaluation and return its job straight away"""
+    try:
+        data = request.get_json()
+        question = data.get('question', '')
+        answer = data.get('answer', '')
+        job_context = data.get('job_context', '')
+        session_id = data.get('session_id')
+        
+        if not question or not answer:
+            return jsonify({'error': 'Question and answer are required'}), 400
+        
+        job, created = evaluation_queue.submit(
+            question, answer, job_context, str(session_id) if session_id else None
+        )
+        
+        return jsonify({
+            'success': True,
+            'job': job,
+            'created': created
+        }), 202 if created else 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/evaluation-jobs/<job_id>', methods=['GET'])
+def get_evaluation_job(job_id):
+    """Get an evaluation job; ?wait=<seconds> blocks until it is done"""
+    try:
+        wait_seconds = min(max(request.args.get('wait', 0, type=float), 0), MAX_JOB_WAIT_SECONDS)
+        if wait_seconds:
+            job = evaluation_queue.wait(job_id, wait_seconds)
+        else:
+            job = evaluation_queue.get(job_id)
+        
+        if job is None:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'job': job
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/evaluate-answers', methods=['POST'])
+@admission_controlled
+def evaluate_answers_endpoint():
+    """Evaluate every answer of a session in one request"""
+    try:
+        data = request.get_json()
+        items = data.get('items', [])
+        job_context = data.get('job_context', '')
+        
+        if not isinstance(items, list) or not items:
+            return jsonify({'error': 'At least one question/answer pair is required'}), 400
+        if len(items) > MAX_EVALUATION_BATCH_SIZE:
+            return jsonify({'error': f'At most {MAX_EVALUATION_BATCH_SIZE} answers can be evaluated at once'}), 400
+        
+        pairs = []
+        for index, item in enumerate(items):
+            question = item.get('question', '') if isinstance(item, dict) else ''
+            answer = item.get('answer', '') if isinstance(item, dict) else ''
+            if not question or not answer:
+                return jsonify({'error': f'Question and answer are required (item {index})'}), 400
+            pairs.append((question, answer))
+        
+        evaluations = evaluate_answers(pairs, job_context)
+        
+        return jsonify({
+            'success': True,
+            'evaluations': evaluations
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions', methods=['POST'])
+def start_session():
+    """Create an in-progress session as soon as its questions are generated"""
+    try:
+        data = request.get_json()
+        job_description = data.get('job_description', '')
+        questions = data.get('questions', [])
+        
+        if not job_description or not isinstance(questions, list) or not questions:
+            return jsonify({'error': 'Job description and questions are required'}), 400
+        
+        session_id = storage.start_session(job_description, questions)
+        
+        return jsonify({
+            'success': True,
+            'session_id': session_id
+        }), 201
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/<int:session_id>', methods=['GET'])
+def get_session(session_id):
+    """Get one session with its answers and evaluations so far"""
+    try:
+        session = storage.get_session(session_id)
+        if session is None:
+            return jsonify({'error': 'Session not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'session': session
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/<int:session_id>/answers/<int:position>', methods=['PUT'])
+def record_answer(session_id, position):
+    """Store the answer and/or evaluation for one question of a session"""
+    try:
+        data = request.get_json()
+        answer = data.get('answer')
+        evaluation = data.get('evaluation')
+        
+        if answer is None and evaluation is None:
+            return jsonify({'error': 'Answer or evaluation is required'}), 400
+        if (answer is not None and not isinstance(answer, str)) or \
+                (evaluation is not None and not isinstance(evaluation, dict)):
+            return jsonify({'error': 'Answer must be a string and evaluation an object'}), 400
+        
+        storage.record_answer(session_id, position, answer, evaluation)
+        
+        return jsonify({'success': True})
+    except storage.SessionNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except storage.SessionFinalizedError as e:
+        return jsonify({'error': str(e)}), 409
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sessions/<int:session_id>/finalize', methods=['POST'])
+def finalize_session(session_id):
+    """Mark a session completed and add its scores to the dashboard stats"""
+    try:
+        storage.finalize_session(session_id)
+        
+        return jsonify({
+            'success': True,
+            'session_id': session_id
+        })
+    except storage.SessionNotFoundError as e:
+        return jsonify({'error': str(e)}), 404
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/save-session', methods=['POST'])
 def save_session():
-    """Save interview session data"""
+    """Save a whole interview session in one request (kept for older clients;
+    the app now writes sessions through /api/sessions as they progress)"""
     try:
         data = request.get_json()
         job_description = data.get('job_description', '')
-        questions = json.dumps(data.get('questions', []))
-        answers = json.dumps(data.get('answers', []))
-        scores = json.dumps(data.get('scores', []))
-        
-        conn = sqlite3.connect('interview_prep.db')
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO sessions (job_description, questions, answers, scores)
-            VALUES (?, ?, ?, ?)
-        ''', (job_description, questions, answers, scores))
-        session_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
+        questions = data.get('questions', [])
+        answers = data.get('answers', [])
+        scores = data.get('scores', [])
+        
+        session_id = storage.save_session(job_description, questions, answers, scores)
         
         return jsonify({
             'success': True,
@@ -450,27 +1002,133 @@ def save_session():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _encode_cursor(created_at, session_id):
+    """Opaque pagination cursor for the last row of a page"""
+    return base64.urlsafe_b64encode(json.dumps([created_at, session_id]).encode()).decode()
+
+def _decode_cursor(cursor):
+    created_at, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    return str(created_at), int(session_id)
+
 @app.route('/api/sessions', methods=['GET'])
 def get_sessions():
-    """Get all interview sessions"""
+    """Get a page of interview sessions, newest first"""
+    try:
+        limit = request.args.get('limit', DEFAULT_SESSIONS_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, MAX_SESSIONS_PAGE_SIZE))
+        cursor = request.args.get('cursor')
+        try:
+            after = _decode_cursor(cursor) if cursor else None
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Invalid cursor'}), 400
+        
+        # Fetch one extra row to know whether another page exists
+        rows = storage.list_sessions(limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        session_list = [
+            {'id': session_id, 'job_description': job_description, 'created_at': created_at, 'status': status}
+            for session_id, job_description, created_at, status in rows
+        ]
+        next_cursor = _encode_cursor(rows[-1][2], rows[-1][0]) if has_more else None
+        
+        return jsonify({
+            'success': True,
+            'sessions': session_list,
+            'total': storage.count_sessions(),
+            'next_cursor': next_cursor
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _snippet_html(snippet):
+    """Escape a search snippet and wrap its matched terms in <mark>"""
+    return html.escape(snippet or '').replace('\x02', '<mark>').replace('\x03', '</mark>')
+
+@app.route('/api/sessions/search', methods=['GET'])
+def search_sessions():
+    """Full-text search over past sessions, best matches first"""
     try:
-        conn = sqlite3.connect('interview_prep.db')
-        cursor = conn.cursor()
-        cursor.execute('SELECT * FROM sessions ORDER BY created_at DESC')
-        sessions = cursor.fetchall()
-        conn.close()
-        
-        session_list = []
-        for session in sessions:
-            session_list.append({
-                'id': session[0],
-                'job_description': session[1][:100] + '...' if len(session[1]) > 100 else session[1],
-                'created_at': session[5]
-            })
+        query = storage.fts_query(request.args.get('q', ''))
+        if query is None:
+            return jsonify({'error': 'Search query is required'}), 400
+        limit = request.args.get('limit', DEFAULT_SESSIONS_PAGE_SIZE, type=int)
+        limit = max(1, min(limit, MAX_SESSIONS_PAGE_SIZE))
+        offset = max(0, request.args.get('offset', 0, type=int))
+        
+        rows, total, ranked = storage.search_sessions(query, limit, offset)
+        
+        results = [
+            {
+                'id': session_id,
+                'created_at': created_at,
+                'snippet': _snippet_html(snippet),
+                # bm25() is lower-is-better; flip it so higher means more relevant
+                'score': round(-score, 3)
+            }
+            for session_id, created_at, snippet, score in rows
+        ]
         
         return jsonify({
             'success': True,
-            'sessions': session_list
+            'results': results,
+            'total': total,
+            'ranked': ranked,
+            'next_offset': offset + len(rows) if offset + len(rows) < ranked else None
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def _parse_export_date(value, end=False):
+    """Turn a YYYY-MM-DD date or ISO timestamp into a created_at bound (UTC).
+    A date used as the end of a range includes that whole day."""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    if end and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed.strftime('%Y-%m-%d %H:%M:%S')
+
+@app.route('/api/sessions/export', methods=['GET'])
+def export_sessions():
+    """Stream sessions with decoded questions, answers and scores as NDJSON or CSV"""
+    try:
+        export_format = request.args.get('format', 'ndjson').lower()
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({'error': f"format must be one of: {', '.join(EXPORT_FORMATS)}"}), 400
+        batch_size = request.args.get('batch_size', DEFAULT_EXPORT_BATCH_SIZE, type=int)
+        batch_size = max(1, min(batch_size, MAX_EXPORT_BATCH_SIZE))
+        try:
+            start = _parse_export_date(request.args['from']) if request.args.get('from') else ''
+            end = _parse_export_date(request.args['to'], end=True) if request.args.get('to') else '9999-12-31'
+        except ValueError:
+            return jsonify({'error': 'Invalid date; use YYYY-MM-DD or an ISO 8601 timestamp'}), 400
+        
+        mimetype, encode = EXPORT_FORMATS[export_format]
+        chunks = encode(storage.iter_sessions(start, end, batch_size))
+        headers = {
+            'Content-Disposition': f'attachment; filename="interview-sessions.{export_format}"',
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'
+        }
+        if request.args.get('gzip', '').lower() in ('1', 'true', 'yes'):
+            chunks = session_export.gzipped(chunks)
+            headers['Content-Encoding'] = 'gzip'
+        
+        return Response(chunks, mimetype=mimetype, headers=headers)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """Dashboard aggregates: averages per score dimension, per skill and per day"""
+    try:
+        top_skills = max(1, min(request.args.get('skills', 20, type=int), 100))
+        days = max(1, min(request.args.get('days', 30, type=int), 365))
+        return jsonify({
+            'success': True,
+            **storage.get_stats(top_skills, days)
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -480,11 +1138,26 @@ def health_check():
     """Health check endpoint"""
     return jsonify({
         'status': 'healthy',
-        'timestamp': datetime.now().isoformat()
+        'timestamp': datetime.now().isoformat(),
+        'database': _db_init_state['status'],
+        'model_client': 'initialized' if llm_client.client_initialized() else 'not initialized',
+        'cache': llm_cache.stats(),
+        'model_circuit': llm_client.breaker.state,
+        'upstream': llm_client.limiter.stats(),
+        'jd_index': jd_index.stats(),
+        'evaluation_jobs': evaluation_queue.stats() if _db_ready.is_set() else None
     })
 
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Prometheus metrics for this process"""
+    return Response(metrics.registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 import os
 
+# Development server; production runs wsgi.py (see Procfile)
 if __name__ == "__main__":
+    init_db()
+    evaluation_queue.start()
     port = int(os.environ.get("PORT", 5000))
     app.run(debug=True, host="0.0.0.0", port=port) 
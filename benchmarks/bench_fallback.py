@@ -0,0 +1,89 @@
+"""Micro-benchmark for the rule-based fallback engine.
+
+Compares the precompiled single-pass matchers in fallback.py against the previous
+per-call substring/regex implementation on long job descriptions and answers.
+
+    python benchmarks/bench_fallback.py [--repeat 200]
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fallback  # noqa: E402
+
+JOB_DESCRIPTION = """
+Senior Full Stack Engineer. We build APIs in Python (Django, Flask) and React
+with TypeScript, deployed on AWS (EC2, S3, Lambda) using Docker and Kubernetes.
+You will own CI/CD pipelines in GitHub Actions, write unit testing and
+integration testing suites, and mentor a cross-functional team. Strong
+communication, stakeholder management and attention to detail required.
+Experience with PostgreSQL, GraphQL, microservices and machine learning is a plus.
+""" * 40
+
+ANSWER = """
+First, I worked on a database optimization project where I implemented caching
+for our API. For example, we designed a new architecture such as a read replica
+layer, then added testing and debugging tools. Additionally, I built deployment
+pipelines and developed a library for the framework we used. Finally, I created
+dashboards to track algorithm performance.
+""" * 20
+
+
+def legacy_get_fallback_skills(job_description):
+    job_lower = job_description.lower()
+    skills = []
+    for category, keywords in fallback.TECH_SKILLS.items():
+        if any(keyword in job_lower for keyword in keywords):
+            skills.append(category.title())
+    for skill, keywords in fallback.SOFT_SKILLS.items():
+        if any(keyword in job_lower for keyword in keywords):
+            skills.append(skill.title())
+    for keyword in fallback.EXPERIENCE_KEYWORDS:
+        if keyword in job_lower:
+            skills.append(f"{keyword.title()} Level")
+    return list(set(skills)) if skills else list(fallback.DEFAULT_SKILLS)
+
+
+def legacy_quality_indicators(answer):
+    return {
+        'technical_terms': len(re.findall(r'\b(api|database|algorithm|framework|library|deployment|testing|debugging|optimization|architecture)\b', answer.lower())),
+        'examples': len(re.findall(r'\b(for example|e\.g\.|such as|like|instance)\b', answer.lower())),
+        'structure': len(re.findall(r'\b(first|second|third|finally|then|next|also|additionally)\b', answer.lower())),
+        'experience': len(re.findall(r'\b(worked|experience|implemented|developed|created|built|designed)\b', answer.lower()))
+    }
+
+
+def bench(label, func, arg, repeat):
+    seconds = min(timeit.repeat(lambda: func(arg), number=repeat, repeat=3)) / repeat
+    print(f"{label:<32} {seconds * 1e6:10.1f} us/call")
+    return seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"job description: {len(JOB_DESCRIPTION)} chars, answer: {len(ANSWER)} chars\n")
+
+    old = bench('skills (legacy)', legacy_get_fallback_skills, JOB_DESCRIPTION, args.repeat)
+    new = bench('skills (compiled)', fallback.get_fallback_skills, JOB_DESCRIPTION, args.repeat)
+    print(f"{'speedup':<32} {old / new:10.1f}x\n")
+
+    old = bench('answer indicators (legacy)', legacy_quality_indicators, ANSWER, args.repeat)
+    new = bench('answer indicators (compiled)', fallback.quality_indicators, ANSWER, args.repeat)
+    print(f"{'speedup':<32} {old / new:10.1f}x\n")
+
+    batch = [('Describe a technical project', ANSWER)] * 50
+    start = timeit.default_timer()
+    fallback.generate_fallback_evaluations(batch)
+    elapsed = timeit.default_timer() - start
+    print(f"{'batch of 50 evaluations':<32} {elapsed * 1e3:10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Job description compaction examples.
+
+Runs jd_compact.compact over sample postings (marked-up sections, markup
+lost in pasting, boilerplate sentences inside content) and reports the
+estimated prompt tokens before and after, plus any line the model needs that
+was dropped and any boilerplate that was kept.
+
+    python benchmarks/bench_jd_compact.py [--budget 1500]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from jd_compact import compact, estimate_tokens  # noqa: E402
+
+# (name, posting, lines that must survive, text that must not)
+EXAMPLES = (
+    (
+        'marked up',
+        """## About Acme
+Acme builds logistics software for thousands of customers worldwide.
+## Responsibilities
+- Design and run Python services on AWS
+- Design and run Python services on AWS
+## Requirements
+- 5+ years of Python and PostgreSQL
+**Benefits**
+- Unlimited PTO
+- Health insurance
+EQUAL OPPORTUNITY
+Acme is an equal opportunity employer.""",
+        ('- Design and run Python services on AWS', '- 5+ years of Python and PostgreSQL'),
+        ('Unlimited PTO', 'equal opportunity', 'logistics software'),
+    ),
+    (
+        'pasted without markup',
+        """About Acme Corp
+Acme is a fast growing leader in rocket logistics, loved by customers worldwide.
+About the Role
+We are hiring a Senior Backend Engineer.
+Responsibilities:
+- Build APIs in Python and Go
+Benefits
+Health insurance
+Unlimited PTO
+What You'll Do
+Own the billing service end to end""",
+        (
+            'We are hiring a Senior Backend Engineer.', '- Build APIs in Python and Go',
+            'Own the billing service end to end'
+        ),
+        ('rocket logistics', 'Unlimited PTO', 'Health insurance'),
+    ),
+    (
+        'boilerplate sentence in content',
+        """Senior Data Engineer
+You will build Spark and Airflow pipelines. We are an equal opportunity employer.
+Experience with Kafka is a plus.""",
+        ('You will build Spark and Airflow pipelines.', 'Experience with Kafka is a plus.'),
+        ('equal opportunity',),
+    ),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--budget', type=int, default=1500, help='token budget passed to compact()')
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'example':<34} {'tokens':>7} {'compact':>8}  result")
+    for name, posting, keep, drop in EXAMPLES:
+        compacted = compact(posting, args.budget)
+        lines = compacted.splitlines()
+        lost = [line for line in keep if line not in lines]
+        kept = [text for text in drop if text.lower() in compacted.lower()]
+        failures += bool(lost or kept)
+        print(f"{name:<34} {estimate_tokens(posting):7d} {estimate_tokens(compacted):8d}  "
+              f"{'ok' if not (lost or kept) else 'FAIL'}")
+        for line in lost:
+            print(f"    lost: {line}")
+        for text in kept:
+            print(f"    kept boilerplate: {text}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Match-rate and latency benchmark for the near-duplicate job description index.
+
+Indexes synthetic postings in a temporary database, then looks up edited
+copies (new company blurb, reordered bullets, extra whitespace) and unrelated
+postings. Reports how many edited copies are matched, how many unrelated
+postings are wrongly matched, and lookup latency against a linear scan.
+
+    python benchmarks/bench_jd_index.py [--postings 2000] [--queries 500]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import jd_index  # noqa: E402
+import storage  # noqa: E402
+
+SKILLS = (
+    'Python Django Flask FastAPI React TypeScript JavaScript Node.js AWS GCP Azure Docker '
+    'Kubernetes Terraform PostgreSQL MySQL MongoDB Redis Kafka Spark Airflow GraphQL REST '
+    'Java Spring Go Rust C++ Swift Kotlin TensorFlow PyTorch pandas SQL Linux CI/CD'
+).split()
+VERBS = ('build', 'own', 'design', 'operate', 'scale', 'maintain', 'test', 'migrate', 'monitor', 'ship')
+NOUNS = (
+    'services', 'pipelines', 'APIs', 'dashboards', 'data models', 'deployments',
+    'integrations', 'internal tools', 'batch jobs', 'mobile apps'
+)
+TEAMS = ('product', 'design', 'data science', 'support', 'security', 'finance', 'sales', 'operations')
+ROLES = ('Backend', 'Frontend', 'Full Stack', 'Data', 'Platform', 'ML', 'Mobile', 'DevOps')
+
+
+def make_posting(rng):
+    role = f"{rng.choice(('Junior', 'Senior', 'Staff'))} {rng.choice(ROLES)} Engineer"
+    bullets = [
+        f"- {rng.choice(VERBS).title()} {rng.choice(NOUNS)} using {' and '.join(rng.sample(SKILLS, 2))}, "
+        f"working with {rng.choice(TEAMS)} to {rng.choice(VERBS)} {rng.choice(NOUNS)} for {rng.choice(TEAMS)}"
+        for _ in range(rng.randint(10, 16))
+    ]
+    blurb = f"About us: {rng.choice(('Acme', 'Globex', 'Initech', 'Umbrella'))} is a fast-growing company."
+    return blurb, role, bullets
+
+
+def render(blurb, role, bullets):
+    return '\n'.join([blurb, role, 'Responsibilities:', *bullets])
+
+
+def edit(rng, blurb, role, bullets):
+    bullets = list(bullets)
+    rng.shuffle(bullets)
+    blurb = "About the company: we are a remote-first team that values ownership."
+    text = render(blurb, role, bullets)
+    return text.replace('\n', '\n\n   ') + '  '
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--postings', type=int, default=2000)
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--threshold', type=float, default=0.8)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    postings = [make_posting(rng) for _ in range(args.postings)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(os.path.join(tmp, 'bench.db'))
+        index = jd_index.JDIndex(threshold=args.threshold)
+        storage.init_db(index.create_table)
+
+        start = time.perf_counter()
+        for posting in postings:
+            text = render(*posting)
+            _, signature = index.lookup(text)
+            index.add(text, signature, ['Skill'])
+        print(f"indexed {args.postings} postings in {time.perf_counter() - start:.2f}s")
+
+        reloaded = jd_index.JDIndex(threshold=args.threshold)
+        start = time.perf_counter()
+        reloaded.load()
+        print(f"loaded index from SQLite in {(time.perf_counter() - start) * 1e3:.1f} ms\n")
+
+        edited = [edit(rng, *posting) for posting in rng.sample(postings, args.queries)]
+        unrelated = [render(*make_posting(rng)) for _ in range(args.queries)]
+
+        latencies = []
+        matched = 0
+        for text in edited:
+            start = time.perf_counter()
+            match, _ = reloaded.lookup(text)
+            latencies.append((time.perf_counter() - start) * 1e3)
+            matched += match is not None and match.similarity >= args.threshold
+        false_matches = 0
+        for text in unrelated:
+            match, _ = reloaded.lookup(text)
+            false_matches += match is not None and match.similarity >= args.threshold
+
+        signatures = [jd_index.signature(render(*posting)) for posting in postings]
+        scan = []
+        for text in edited[:50]:
+            start = time.perf_counter()
+            query = jd_index.signature(text)
+            max(jd_index.similarity(query, stored) for stored in signatures)
+            scan.append((time.perf_counter() - start) * 1e3)
+
+        print(f"{'edited copies matched':<28} {matched}/{len(edited)} ({matched / len(edited):.1%})")
+        print(f"{'unrelated postings matched':<28} {false_matches}/{len(unrelated)}")
+        print(f"{'LSH lookup p50 / p95':<28} {percentile(latencies, 0.5):.2f} / {percentile(latencies, 0.95):.2f} ms")
+        print(f"{'linear scan p50':<28} {percentile(scan, 0.5):.2f} ms")
+        print(f"\nindex stats: {reloaded.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Question set checks for app.assemble_interview_questions.
+
+Runs the question bank path against the local model stub, then the same
+requests with every model call failing, and reports how many model calls each
+request made and whether it got exactly 3 distinct technical + 2 distinct
+behavioral questions. A bank seeded with enough questions for some of the
+requested skills must serve the set without any model call. Exits 1 if any
+set has the wrong shape or a seeded request reached the model.
+
+    python benchmarks/bench_question_bank.py
+"""
+import argparse
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stub_model import StubConfig, start as start_stub  # noqa: E402
+
+SKILL_SETS = (
+    [],
+    ['Python'],
+    ['Rust', 'Go'],
+    ['Python', 'SQL', 'React', 'AWS'],
+)
+
+# Model skill lists mix a few technical skills with soft skills
+SEEDED_SKILLS = ['Python', 'SQL', 'Communication', 'Teamwork', 'Problem Solving', 'Leadership']
+SEEDED_DIFFICULTY = 'advanced'
+
+
+def shape_problems(questions):
+    """Describe what is wrong with a question set, if anything"""
+    problems = []
+    for kind, count in (('technical', 3), ('behavioral', 2)):
+        texts = [q['question'] for q in questions if str(q.get('type', '')).lower() == kind]
+        if len(texts) != count:
+            problems.append(f"{len(texts)} {kind}")
+        if len(set(texts)) != len(texts):
+            problems.append(f"duplicate {kind}")
+    if len(questions) != 5:
+        problems.append(f"{len(questions)} questions")
+    return problems
+
+
+def model_calls(config):
+    return sum(config.counts.values())
+
+
+def run(label, app, config, repeat):
+    failures = 0
+    for skills in SKILL_SETS:
+        for attempt in range(repeat):
+            before = model_calls(config)
+            questions = app.assemble_interview_questions(
+                f"{label} role {attempt} needing {', '.join(skills) or 'general skills'}", skills
+            )
+            problems = shape_problems(questions)
+            failures += bool(problems)
+            print(f"{label:<12} {', '.join(skills) or '(none)':<28} {attempt:>3} "
+                  f"{model_calls(config) - before:>6}  {'ok' if not problems else 'FAIL ' + ', '.join(problems)}")
+    return failures
+
+
+def seed(question_bank):
+    questions = [
+        {'question': f"Seeded {skill} question {n}?", 'type': 'technical', 'skill': skill}
+        for skill in ('Python', 'SQL') for n in range(4)
+    ] + [
+        {'question': f"Seeded behavioral question {n}?", 'type': 'behavioral', 'skill': 'Teamwork'}
+        for n in range(2)
+    ]
+    question_bank.add_questions(questions, SEEDED_DIFFICULTY)
+
+
+def run_seeded(app, config, repeat):
+    failures = 0
+    for attempt in range(repeat):
+        before = model_calls(config)
+        questions = app.assemble_interview_questions(
+            f"seeded role {attempt}", SEEDED_SKILLS, SEEDED_DIFFICULTY
+        )
+        calls = model_calls(config) - before
+        problems = shape_problems(questions) + ([f"{calls} model calls"] if calls else [])
+        failures += bool(problems)
+        print(f"{'seeded':<12} {'Python, SQL + soft skills':<28} {attempt:>3} "
+              f"{calls:>6}  {'ok' if not problems else 'FAIL ' + ', '.join(problems)}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=3, help='requests per skill set and path')
+    args = parser.parse_args()
+
+    config = StubConfig(latency=0.0, jitter=0.0)
+    stub = start_stub(config)
+    os.environ['DATABASE_PATH'] = os.path.join(tempfile.mkdtemp(), 'bench.db')
+    os.environ['OPENAI_BASE_URL'] = f'http://127.0.0.1:{stub.server_address[1]}/v1'
+    os.environ.setdefault('OPENAI_API_KEY', 'stub')
+    os.environ['LLM_MAX_RETRIES'] = '0'
+
+    import app
+
+    app.init_db()
+    print(f"{'path':<12} {'skills':<28} {'#':>3} {'calls':>6}  result")
+    seed(app.question_bank)
+    failures = run_seeded(app, config, args.repeat)
+    failures += run('bank', app, config, args.repeat)
+    config.error_rate = 1.0
+    failures += run('model down', app, config, args.repeat)
+    stub.shutdown()
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""Full-text session search benchmark.
+
+Fills a temporary database with synthetic sessions through the normal write
+path (so the FTS triggers run), then times /api/sessions/search queries
+(storage.search_sessions) for common and rare terms, several terms, a phrase
+and a prefix, on the first and 50th page, next to a full scan of the raw session text.
+
+    python benchmarks/bench_search.py [--sessions 200000] [--repeat 20]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import storage  # noqa: E402
+
+ROLES = ('Backend Engineer', 'Frontend Engineer', 'Data Engineer', 'Platform Engineer', 'ML Engineer', 'SRE')
+STACK = (
+    'Python', 'Django', 'Flask', 'React', 'TypeScript', 'AWS', 'Docker', 'Kubernetes', 'PostgreSQL',
+    'Redis', 'Kafka', 'GraphQL', 'Go', 'Rust', 'Terraform', 'Spark', 'Airflow', 'Elixir'
+)
+# Long-tailed popularity: the first skills appear in most sessions, the last in few
+WEIGHTS = [1 / (rank + 1) ** 1.5 for rank in range(len(STACK))]
+TOPICS = (
+    'system design', 'incident response', 'code review', 'database migrations', 'caching strategy',
+    'API versioning', 'load balancing', 'feature flags', 'observability', 'capacity planning'
+)
+QUERIES = (
+    'elixir',
+    'python',
+    '"system design"',
+    'kubernetes terraform',
+    'python "system design"',
+    'postgre*',
+    'haskell',
+)
+
+
+def synthetic_session(rng):
+    role = rng.choice(ROLES)
+    skills = list(dict.fromkeys(rng.choices(STACK, weights=WEIGHTS, k=8)))[:4]
+    topics = rng.sample(TOPICS, 3)
+    job_description = (
+        f"We are hiring a {role} to build services with {', '.join(skills)}. "
+        f"You will own {topics[0]} and {topics[1]} for a growing platform."
+    )
+    questions = [
+        {'question': f"How would you approach {topic} in a {skill} service?", 'type': 'technical', 'skill': skill}
+        for topic, skill in zip(topics, skills)
+    ] + [{'question': 'Tell me about a conflict on your team.', 'type': 'behavioral', 'skill': 'Teamwork'}]
+    answers = [
+        f"I used {rng.choices(STACK, weights=WEIGHTS)[0]} and focused on {rng.choice(TOPICS)} with clear metrics."
+        for _ in questions
+    ]
+    scores = [{'overall_score': rng.randint(4, 9), 'feedback': 'Solid answer.'} for _ in questions]
+    return job_description, questions, answers, scores
+
+
+def fill(count, rng, chunk=5000):
+    for start in range(0, count, chunk):
+        sessions = [synthetic_session(rng) for _ in range(min(chunk, count - start))]
+
+        def write(conn):
+            for job_description, questions, answers, scores in sessions:
+                session_id = conn.execute(storage.INSERT_SESSION, (
+                    job_description, json.dumps(questions), json.dumps(answers), json.dumps(scores)
+                )).lastrowid
+                storage._index_session(conn, session_id, questions, answers, scores, storage._today())
+        storage.write(write, batched=False)
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=200000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        storage.configure(os.path.join(tmp, 'search.db'))
+        storage.init_db()
+        start = time.perf_counter()
+        fill(args.sessions, random.Random(args.seed))
+        print(f"indexed {args.sessions} sessions in {time.perf_counter() - start:.1f}s\n")
+
+        print(f"{'query':<24} {'matches':>8} {'page 1 ms':>10} {'page 50 ms':>11}")
+        for text in QUERIES:
+            query = storage.fts_query(text)
+            first, (_, total, _) = timed(lambda: storage.search_sessions(query, 20, 0), args.repeat)
+            deep, _ = timed(lambda: storage.search_sessions(query, 20, 980), args.repeat)
+            print(f"{text:<24} {total:8d} {first:10.2f} {deep:11.2f}")
+
+        def scan():
+            with storage.connection() as conn:
+                return conn.execute(
+                    'SELECT COUNT(*) FROM sessions WHERE job_description LIKE ? OR questions LIKE ? OR answers LIKE ?',
+                    ('%kubernetes%',) * 3
+                ).fetchone()
+        ms, _ = timed(scan, max(1, args.repeat // 4))
+        print(f"\nscanning every session's text for 'kubernetes' (previous approach): {ms:.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+"""Concurrency load test for the production serving mode.
+
+Starts a local stub of the chat completions API with a fixed latency, then
+runs the app under gunicorn twice against it: with sync workers (one request
+per worker at a time) and with a single gevent worker (wsgi.py). Each run
+fires the same burst of concurrent /api/evaluate-answer requests and reports
+throughput, latency and how many requests reached the stub; the rest were
+served by the fallback path or rejected by admission control.
+
+    python benchmarks/bench_serving.py [--clients 200] [--requests 600] [--latency 0.5]
+"""
+import argparse
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from stub_model import StubConfig, start as start_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f'http://127.0.0.1:{port}/api/health', timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.2)
+    raise RuntimeError('server did not start')
+
+
+def post(port, index):
+    payload = json.dumps({
+        'question': 'Explain how you would scale a web service.',
+        'answer': f'Answer number {index}: I would add caching and horizontal scaling.',
+        'job_context': 'Backend engineer'
+    }).encode('utf-8')
+    req = urllib.request.Request(
+        f'http://127.0.0.1:{port}/api/evaluate-answer', data=payload,
+        headers={'Content-Type': 'application/json'}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=120) as response:
+            response.read()
+            status = response.status
+    except urllib.error.HTTPError as e:
+        status = e.code
+    return status, time.perf_counter() - start
+
+
+def run(label, server_args, env, clients, requests, stub):
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--timeout', '120',
+         '--log-level', 'warning', *server_args],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        wait_until_up(port)
+        stub.counts.clear()
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=clients) as pool:
+            results = list(pool.map(lambda i: post(port, i), range(requests)))
+        elapsed = time.perf_counter() - start
+    finally:
+        process.terminate()
+        process.wait()
+
+    latencies = sorted(seconds for _, seconds in results)
+    statuses = {}
+    for status, _ in results:
+        statuses[status] = statuses.get(status, 0) + 1
+    print(f"{label}")
+    print(f"  throughput      {requests / elapsed:8.1f} req/s ({elapsed:.1f}s for {requests})")
+    print(f"  latency p50/p95 {latencies[len(latencies) // 2]:8.2f} / {latencies[int(len(latencies) * 0.95)]:.2f} s")
+    print(f"  statuses        {statuses}")
+    print(f"  reached model   {sum(stub.counts.values())}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=600)
+    parser.add_argument('--latency', type=float, default=0.5)
+    parser.add_argument('--sync-workers', type=int, default=4)
+    args = parser.parse_args()
+
+    config = StubConfig(latency=args.latency, jitter=0)
+    stub = start_stub(config)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(
+            os.environ,
+            OPENAI_API_KEY='stub',
+            OPENAI_BASE_URL=f'http://127.0.0.1:{stub.server_address[1]}/v1',
+            DATABASE_PATH=os.path.join(tmp, 'bench.db'),
+            LLM_MAX_RETRIES='0',
+            LLM_DEADLINE_SECONDS='60'
+        )
+        print(f"{args.requests} requests from {args.clients} concurrent clients, "
+              f"model latency {args.latency}s\n")
+        run(f'sync, {args.sync_workers} workers', ['--workers', str(args.sync_workers), 'app:app'],
+            env, args.clients, args.requests, config)
+        run('gevent, 1 worker', ['--worker-class', 'gevent', '--workers', '1',
+                                 '--worker-connections', '1000', 'wsgi:app'],
+            env, args.clients, args.requests, config)
+        overload_env = dict(env, LLM_MAX_CONCURRENCY='16', LLM_MAX_QUEUE='16')
+        run('gevent, 1 worker, 16 upstream slots + 16 queued (fallback when full)',
+            ['--worker-class', 'gevent', '--workers', '1', '--worker-connections', '1000', 'wsgi:app'],
+            overload_env, args.clients, args.requests, config)
+        run('gevent, 1 worker, 16 upstream slots + 16 queued (503 when full)',
+            ['--worker-class', 'gevent', '--workers', '1', '--worker-connections', '1000', 'wsgi:app'],
+            dict(overload_env, LLM_OVERLOAD_POLICY='reject'), args.clients, args.requests, config)
+
+    stub.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""Cold-start benchmark.
+
+Measures what a scale-to-zero deployment pays before the first user request
+is answered:
+
+- import time of app.py in a fresh interpreter (median of --imports runs), and
+  whether heavy modules (openai, httpx, dotenv) were loaded or the database
+  was touched by the import
+- time from spawning the production server (gunicorn + gevent, wsgi.py) on an
+  empty database to the first /api/health response, the first database-backed
+  response (/api/sessions) and the first model-backed response
+  (/api/parse-job-description against the local stub model)
+
+    python benchmarks/bench_startup.py [--imports 5] [--starts 3] [--output startup.json]
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from stub_model import StubConfig, start as start_stub
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ('openai', 'httpx', 'dotenv')
+
+IMPORT_PROBE = """
+import json, os, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({
+    'seconds': elapsed,
+    'loaded': [name for name in %r if name in sys.modules],
+    'database_created': os.path.exists(os.environ['DATABASE_PATH'])
+}))
+""" % (HEAVY_MODULES,)
+
+
+def measure_import(env):
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_PROBE], cwd=ROOT, env=env,
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def request(port, path, payload=None):
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(
+        f'http://127.0.0.1:{port}{path}', data=data, headers={'Content-Type': 'application/json'}
+    )
+    with urllib.request.urlopen(req, timeout=30) as response:
+        response.read()
+        return response.status
+
+
+def first_response(port, path, payload=None, started=None, timeout=60):
+    """Poll until path answers 200; returns seconds since started"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if request(port, path, payload) == 200:
+                return time.perf_counter() - started
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.005)
+    raise RuntimeError(f'{path} did not answer within {timeout}s')
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def measure_cold_start(env):
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--worker-class', 'gevent', '--workers', '1',
+         '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'wsgi:app'],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        health = first_response(port, '/api/health', started=started)
+        sessions = first_response(port, '/api/sessions', started=started)
+        model = first_response(
+            port, '/api/parse-job-description',
+            {'job_description': 'Backend Engineer with Python, PostgreSQL and Docker experience'},
+            started=started
+        )
+    finally:
+        process.terminate()
+        process.wait()
+    return {'health': health, 'database': sessions, 'model': model}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--imports', type=int, default=5, help='fresh-interpreter imports to time')
+    parser.add_argument('--starts', type=int, default=3, help='server cold starts to time')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    args = parser.parse_args()
+
+    stub = start_stub(StubConfig(latency=0.05, jitter=0))
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        base_env = dict(
+            os.environ,
+            OPENAI_API_KEY='stub',
+            OPENAI_BASE_URL=f'http://127.0.0.1:{stub.server_address[1]}/v1'
+        )
+
+        imports = []
+        for run in range(args.imports):
+            imports.append(measure_import(dict(base_env, DATABASE_PATH=os.path.join(tmp, f'import-{run}.db'))))
+        results['import_seconds'] = statistics.median(probe['seconds'] for probe in imports)
+        results['heavy_modules_loaded'] = imports[-1]['loaded']
+        results['import_creates_database'] = imports[-1]['database_created']
+
+        starts = []
+        for run in range(args.starts):
+            starts.append(measure_cold_start(dict(base_env, DATABASE_PATH=os.path.join(tmp, f'start-{run}.db'))))
+        for key in ('health', 'database', 'model'):
+            results[f'first_{key}_response_seconds'] = statistics.median(start[key] for start in starts)
+    stub.shutdown()
+
+    print(f"import app                  {results['import_seconds'] * 1000:8.1f} ms (median of {args.imports})")
+    print(f"  heavy modules loaded      {', '.join(results['heavy_modules_loaded']) or 'none'}")
+    print(f"  database touched          {'yes' if results['import_creates_database'] else 'no'}")
+    print(f"spawn -> first response (gunicorn + gevent, median of {args.starts})")
+    print(f"  /api/health               {results['first_health_response_seconds'] * 1000:8.1f} ms")
+    print(f"  /api/sessions (database)  {results['first_database_response_seconds'] * 1000:8.1f} ms")
+    print(f"  parse-job-description     {results['first_model_response_seconds'] * 1000:8.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
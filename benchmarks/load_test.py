@@ -0,0 +1,321 @@
+"""End-to-end load test against a local stub model server.
+
+Starts benchmarks/stub_model.py and the app (under gunicorn, gevent or sync
+workers) on free ports with a throwaway database, then runs complete interview
+sessions from concurrent virtual users:
+
+    parse job description -> generate questions -> evaluate x5 -> save -> list sessions
+
+Reports p50/p95/p99 latency and throughput per endpoint, and writes the
+results to JSON so runs can be compared before and after a change:
+
+    python benchmarks/load_test.py --sessions 100 --concurrency 25 --output before.json
+    python benchmarks/load_test.py --sessions 100 --concurrency 25 --output after.json --compare before.json
+
+Stub behaviour is set with --latency, --jitter, --error-rate and
+--malformed-rate; extra app settings can be passed with --env KEY=VALUE.
+"""
+import argparse
+import json
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+ROLES = ('Backend Engineer', 'Frontend Engineer', 'Data Engineer', 'Platform Engineer', 'ML Engineer')
+STACK = (
+    'Python', 'Django', 'Flask', 'React', 'TypeScript', 'AWS', 'Docker', 'Kubernetes',
+    'PostgreSQL', 'Redis', 'Kafka', 'GraphQL', 'Go', 'SQL', 'Terraform'
+)
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+ANSWER_SENTENCES = (
+    "I designed the service around an event queue so producers never blocked on slow consumers.",
+    "For example, we cut p95 latency from 800ms to 120ms by adding a read-through cache.",
+    "First I reproduced the issue locally, then added tracing to narrow it down to one query.",
+    "We agreed on a rollout plan with feature flags and monitored error rates at each step.",
+    "I wrote integration tests for the failure modes before changing the retry logic.",
+    "Additionally, I documented the trade-offs so the team could review the decision later."
+)
+
+ENDPOINTS = ('parse-job-description', 'generate-questions', 'evaluate-answer', 'save-session', 'sessions')
+
+
+def job_descriptions(count, rng):
+    """A pool of distinct postings; sessions draw from it so some repeat"""
+    postings = []
+    for index in range(count):
+        role = rng.choice(ROLES)
+        skills = rng.sample(STACK, 5)
+        bullets = '\n'.join(
+            f"- {verb} {skill} services used by millions of customers"
+            for verb, skill in zip(('Build', 'Operate', 'Scale', 'Test', 'Review'), skills)
+        )
+        postings.append(
+            f"Posting {index}: {role}\nWe are hiring a {role} with experience in "
+            f"{', '.join(skills)}.\nResponsibilities:\n{bullets}\nStrong communication required."
+        )
+    return postings
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_up(url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(url, timeout=1).read()
+            return
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up")
+
+
+class Recorder:
+    """Thread-safe per-endpoint latency and status log"""
+
+    def __init__(self):
+        self.samples = {endpoint: [] for endpoint in ENDPOINTS}
+        self.statuses = {endpoint: {} for endpoint in ENDPOINTS}
+        self.sessions = []
+        self.lock = threading.Lock()
+
+    def add(self, endpoint, seconds, status):
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            self.statuses[endpoint][status] = self.statuses[endpoint].get(status, 0) + 1
+
+
+def call(base, recorder, endpoint, payload=None):
+    """POST payload (or GET when None); returns the decoded body or None on failure"""
+    data = json.dumps(payload).encode('utf-8') if payload is not None else None
+    req = urllib.request.Request(
+        f"{base}/api/{endpoint}", data=data,
+        headers={'Content-Type': 'application/json'} if data else {}
+    )
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as response:
+            body = json.loads(response.read())
+            status = response.status
+    except urllib.error.HTTPError as e:
+        body, status = None, e.code
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        body, status = None, 'connection_error'
+    recorder.add(endpoint, time.perf_counter() - start, status)
+    return body
+
+
+def run_session(base, recorder, job_description, rng):
+    started = time.perf_counter()
+    parsed = call(base, recorder, 'parse-job-description', {'job_description': job_description})
+    skills = (parsed or {}).get('skills') or ['Python']
+    generated = call(base, recorder, 'generate-questions', {
+        'job_description': job_description,
+        'skills': skills,
+        'difficulty': rng.choice(DIFFICULTIES)
+    })
+    questions = ((generated or {}).get('questions') or [{'question': 'Tell me about yourself.'}])[:5]
+    answers, scores = [], []
+    for question in questions:
+        answer = ' '.join(rng.sample(ANSWER_SENTENCES, rng.randint(1, len(ANSWER_SENTENCES))))
+        evaluated = call(base, recorder, 'evaluate-answer', {
+            'question': question.get('question', ''),
+            'answer': answer,
+            'job_context': job_description
+        })
+        answers.append(answer)
+        scores.append((evaluated or {}).get('evaluation') or {})
+    call(base, recorder, 'save-session', {
+        'job_description': job_description,
+        'questions': questions,
+        'answers': answers,
+        'scores': scores
+    })
+    call(base, recorder, 'sessions')
+    with recorder.lock:
+        recorder.sessions.append(time.perf_counter() - started)
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(p / 100 * len(values))) - 1))]
+
+
+def summarize(samples, elapsed):
+    return {
+        'requests': len(samples),
+        'throughput_rps': round(len(samples) / elapsed, 2) if elapsed else 0.0,
+        'p50_ms': round(percentile(samples, 50) * 1000, 1),
+        'p95_ms': round(percentile(samples, 95) * 1000, 1),
+        'p99_ms': round(percentile(samples, 99) * 1000, 1),
+        'max_ms': round(max(samples) * 1000, 1) if samples else 0.0
+    }
+
+
+def app_counters(base):
+    """Fallback and parse-failure counters from /api/metrics"""
+    counters = {}
+    try:
+        text = urllib.request.urlopen(f"{base}/api/metrics", timeout=5).read().decode('utf-8')
+    except (urllib.error.URLError, ConnectionError, socket.timeout):
+        return counters
+    for line in text.splitlines():
+        if line.startswith(('fallbacks_total', 'llm_json_parse_failures_total', 'llm_upstream_rejected_total')):
+            name, value = line.rsplit(' ', 1)
+            counters[name] = float(value)
+    return counters
+
+
+def print_report(results):
+    print(f"\n{results['sessions']['completed']} sessions in {results['duration_seconds']}s "
+          f"({results['sessions']['throughput_per_second']} sessions/s), "
+          f"session p50 {results['sessions']['p50_ms']} ms, p95 {results['sessions']['p95_ms']} ms\n")
+    print(f"{'endpoint':<24}{'requests':>9}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses")
+    for endpoint, row in results['endpoints'].items():
+        print(f"{endpoint:<24}{row['requests']:>9}{row['throughput_rps']:>9}{row['p50_ms']:>10}"
+              f"{row['p95_ms']:>10}{row['p99_ms']:>10}  {row['statuses']}")
+    if results['stub_calls']:
+        print(f"\nstub model calls: {results['stub_calls']}")
+    if results['app_counters']:
+        print(f"app counters: {results['app_counters']}")
+
+
+def print_comparison(results, baseline):
+    print(f"\ncompared with {baseline['started_at']} ({baseline['config']}):")
+    print(f"{'endpoint':<24}{'p50 ms':>26}{'p95 ms':>26}{'p99 ms':>26}{'req/s':>26}")
+    for endpoint, row in results['endpoints'].items():
+        old = baseline['endpoints'].get(endpoint)
+        if not old:
+            continue
+        cells = []
+        for key in ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'):
+            change = (row[key] - old[key]) / old[key] * 100 if old[key] else 0.0
+            cells.append(f"{old[key]}->{row[key]} ({change:+.0f}%)")
+        print(f"{endpoint:<24}" + ''.join(f"{cell:>26}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50, help='complete sessions to run')
+    parser.add_argument('--concurrency', type=int, default=10, help='sessions running at once')
+    parser.add_argument('--jd-pool', type=int, default=20, help='distinct job descriptions sessions draw from')
+    parser.add_argument('--latency', type=float, default=0.5, help='stub seconds per model call')
+    parser.add_argument('--jitter', type=float, default=0.2)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--server', choices=('gevent', 'sync'), default='gevent')
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--env', action='append', default=[], metavar='KEY=VALUE', help='extra app setting')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--output', default='load_test_results.json')
+    parser.add_argument('--compare', help='earlier results file to diff against')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    postings = job_descriptions(args.jd_pool, rng)
+    stub_port, app_port = free_port(), free_port()
+    base = f"http://127.0.0.1:{app_port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        stub = subprocess.Popen(
+            [sys.executable, os.path.join(HERE, 'stub_model.py'), '--port', str(stub_port),
+             '--latency', str(args.latency), '--jitter', str(args.jitter),
+             '--error-rate', str(args.error_rate), '--malformed-rate', str(args.malformed_rate),
+             '--seed', str(args.seed)],
+            stdout=subprocess.PIPE, text=True
+        )
+        env = dict(
+            os.environ,
+            OPENAI_API_KEY='stub',
+            OPENAI_BASE_URL=f"http://127.0.0.1:{stub_port}/v1",
+            DATABASE_PATH=os.path.join(tmp, 'load_test.db')
+        )
+        env.update(setting.split('=', 1) for setting in args.env)
+        server_args = ['--workers', str(args.workers), 'app:app']
+        if args.server == 'gevent':
+            server_args = ['--worker-class', 'gevent', '--worker-connections', '1000',
+                           '--workers', str(args.workers), 'wsgi:app']
+        app = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--bind', f"127.0.0.1:{app_port}", '--timeout', '300',
+             '--log-level', 'warning', *server_args],
+            cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_up(f"{base}/api/health")
+            recorder = Recorder()
+            started_at = datetime.now().isoformat(timespec='seconds')
+            start = time.perf_counter()
+            session_rngs = [random.Random(args.seed * 100003 + i) for i in range(args.sessions)]
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                list(pool.map(
+                    lambda i: run_session(base, recorder, session_rngs[i].choice(postings), session_rngs[i]),
+                    range(args.sessions)
+                ))
+            elapsed = time.perf_counter() - start
+            counters = app_counters(base)
+        finally:
+            app.terminate()
+            app.wait()
+            stub.send_signal(signal.SIGINT)
+            stub_output = stub.communicate()[0].strip().splitlines()
+
+    try:
+        stub_calls = json.loads(stub_output[-1])
+    except (IndexError, ValueError):
+        stub_calls = {}
+
+    endpoints = {}
+    for endpoint in ENDPOINTS:
+        endpoints[endpoint] = summarize(recorder.samples[endpoint], elapsed)
+        endpoints[endpoint]['statuses'] = {str(k): v for k, v in recorder.statuses[endpoint].items()}
+    session_summary = summarize(recorder.sessions, elapsed)
+    results = {
+        'started_at': started_at,
+        'config': {
+            key: getattr(args, key) for key in (
+                'sessions', 'concurrency', 'jd_pool', 'latency', 'jitter', 'error_rate',
+                'malformed_rate', 'server', 'workers', 'env', 'seed'
+            )
+        },
+        'duration_seconds': round(elapsed, 2),
+        'sessions': {
+            'completed': session_summary['requests'],
+            'throughput_per_second': session_summary['throughput_rps'],
+            'p50_ms': session_summary['p50_ms'],
+            'p95_ms': session_summary['p95_ms'],
+            'p99_ms': session_summary['p99_ms']
+        },
+        'endpoints': endpoints,
+        'stub_calls': stub_calls,
+        'app_counters': counters
+    }
+
+    print_report(results)
+    if args.compare:
+        with open(args.compare) as f:
+            print_comparison(results, json.load(f))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nresults written to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,205 @@
+"""Local stand-in for the OpenAI chat completions API.
+
+Answers skill extraction, question generation, combined prepare-interview
+and answer evaluation prompts
+with plausible JSON after a configurable delay, and can be told to fail a
+fraction of calls (HTTP 500) or return truncated, unparseable JSON. Streamed
+requests (stream=true) are answered as Server-Sent Events. Point the app at
+it with OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+    python benchmarks/stub_model.py [--port 8900] [--latency 0.5] [--error-rate 0.02] [--malformed-rate 0.02]
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+KNOWN_SKILLS = (
+    'Python', 'Django', 'Flask', 'React', 'TypeScript', 'JavaScript', 'AWS', 'Docker',
+    'Kubernetes', 'PostgreSQL', 'Redis', 'Kafka', 'GraphQL', 'Java', 'Go', 'SQL', 'Terraform'
+)
+SOFT_SKILLS = ('Communication', 'Teamwork', 'Problem Solving', 'Mentoring')
+
+
+class StubConfig:
+    """Behaviour shared by every request handler"""
+
+    def __init__(self, latency=0.5, jitter=0.2, error_rate=0.0, malformed_rate=0.0, seed=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.malformed_rate = malformed_rate
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def count(self, key):
+        with self.lock:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def draw(self):
+        """Return (delay, fail, malformed) for one call"""
+        with self.lock:
+            delay = max(0.0, self.latency * (1 + self.random.uniform(-self.jitter, self.jitter)))
+            roll = self.random.random()
+        return delay, roll < self.error_rate, self.error_rate <= roll < self.error_rate + self.malformed_rate
+
+
+def _skills_for(text):
+    found = [skill for skill in KNOWN_SKILLS if re.search(rf'\b{re.escape(skill.lower())}\b', text.lower())]
+    return (found or ['Python', 'SQL'])[:12] + list(SOFT_SKILLS[:3])
+
+
+def _questions_for(text):
+    match = re.search(r'Extracted Skills: (.*)', text)
+    skills = [s.strip() for s in match.group(1).split(',') if s.strip()] if match else []
+    skills = skills or ['Python']
+    questions = [
+        {
+            'question': f"How have you used {skills[i % len(skills)]} to solve a production problem ({i + 1})?",
+            'type': 'technical',
+            'skill': skills[i % len(skills)]
+        }
+        for i in range(3)
+    ]
+    questions += [
+        {'question': 'Tell me about a disagreement with a teammate and how you resolved it.',
+         'type': 'behavioral', 'skill': 'Teamwork'},
+        {'question': 'Describe a time you explained a technical decision to a non-technical audience.',
+         'type': 'behavioral', 'skill': 'Communication'}
+    ]
+    return questions
+
+
+def _evaluation_for(text):
+    answer = re.search(r'Answer: (.*)', text)
+    length = len(answer.group(1)) if answer else 0
+    score = min(9.5, 4 + length / 60)
+    return {
+        'overall_score': round(score, 1),
+        'technical_accuracy': round(score),
+        'communication_clarity': round(score),
+        'depth_of_knowledge': round(score - 1),
+        'contextual_understanding': round(score),
+        'problem_solving': round(score),
+        'feedback': 'The answer covers the main points; add a concrete example with measurable results.',
+        'strengths': ['Clear structure', 'Relevant experience'],
+        'improvements': ['Quantify impact', 'Discuss trade-offs']
+    }
+
+
+def respond_to(messages):
+    """Return (kind, content) for a chat request"""
+    system = next((m['content'] for m in messages if m.get('role') == 'system'), '')
+    user = next((m['content'] for m in messages if m.get('role') == 'user'), '')
+    if 'Extract 15-25 skills' in system:
+        skills = _skills_for(user)
+        return 'prepare', json.dumps({
+            'skills': skills,
+            'questions': _questions_for(f"Extracted Skills: {', '.join(skills)}")
+        })
+    if 'Extract ALL relevant skills' in system:
+        return 'skills', json.dumps(_skills_for(user))
+    if 'interview questions' in system:
+        return 'questions', json.dumps(_questions_for(user))
+    return 'evaluation', json.dumps(_evaluation_for(user))
+
+
+def make_handler(config):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            kind, content = respond_to(body.get('messages', []))
+            delay, fail, malformed = config.draw()
+            time.sleep(delay)
+            if fail:
+                config.count(f'{kind}:error')
+                self._send(500, {'error': {'message': 'stub failure', 'type': 'server_error'}})
+                return
+            if malformed:
+                config.count(f'{kind}:malformed')
+                content = content[:max(1, len(content) // 2)]
+            else:
+                config.count(f'{kind}:ok')
+            if body.get('stream'):
+                self._stream(content)
+            else:
+                self._send(200, {
+                    'id': 'stub', 'object': 'chat.completion', 'created': int(time.time()), 'model': 'stub',
+                    'choices': [{
+                        'index': 0, 'finish_reason': 'stop',
+                        'message': {'role': 'assistant', 'content': content}
+                    }],
+                    'usage': {
+                        'prompt_tokens': len(json.dumps(body.get('messages', []))) // 4,
+                        'completion_tokens': len(content) // 4,
+                        'total_tokens': (len(json.dumps(body.get('messages', []))) + len(content)) // 4
+                    }
+                })
+
+        def _send(self, status, payload):
+            data = json.dumps(payload).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _stream(self, content):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            for start in range(0, len(content), 24):
+                chunk = {
+                    'id': 'stub', 'object': 'chat.completion.chunk', 'created': int(time.time()), 'model': 'stub',
+                    'choices': [{'index': 0, 'delta': {'content': content[start:start + 24]}, 'finish_reason': None}]
+                }
+                self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode('utf-8'))
+            self.wfile.write(b"data: [DONE]\n\n")
+            self.close_connection = True
+
+        def log_message(self, *args):
+            pass
+
+    return StubHandler
+
+
+def start(config, host='127.0.0.1', port=0):
+    """Serve the stub on a background thread; returns the server"""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8900)
+    parser.add_argument('--latency', type=float, default=0.5, help='mean seconds per call')
+    parser.add_argument('--jitter', type=float, default=0.2, help='latency varies by +/- this fraction')
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--malformed-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency, args.jitter, args.error_rate, args.malformed_rate, args.seed)
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config))
+    server.daemon_threads = True
+    print(f"Stub model API on http://{args.host}:{server.server_address[1]}/v1", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(json.dumps(config.counts, sort_keys=True))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,288 @@
+"""Persistent queue of answer evaluation jobs.
+
+Submitting an answer stores a job in SQLite and returns its ID straight
+away; a pool of worker threads evaluates queued jobs in the background.
+Jobs are keyed by (session, question, answer), so resubmitting the same
+answer returns the existing job instead of paying for a second model call,
+while a changed answer gets a job of its own. A failed attempt is
+retried with backoff; once attempts run out the job completes with the
+rule-based fallback evaluation.
+
+Workers claim a job by leasing it. If a process dies mid-evaluation the lease
+expires and any worker (in this or another process sharing the database)
+picks the job up again, so queued and running jobs survive restarts.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+import storage
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+
+CLAIM_JOB = '''
+    SELECT id, question, answer, job_context, attempts FROM evaluation_jobs
+    WHERE (status = 'queued' AND available_at <= ?)
+       OR (status = 'running' AND lease_expires_at <= ?)
+    ORDER BY available_at
+    LIMIT 1
+'''
+SELECT_JOB = '''
+    SELECT id, session_id, status, attempts, result, fallback, error, created_at, updated_at
+    FROM evaluation_jobs WHERE id = ?
+'''
+
+
+def create_table(conn):
+    """Create the jobs table and its claim index on an open connection"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS evaluation_jobs (
+            id TEXT PRIMARY KEY,
+            idempotency_key TEXT NOT NULL UNIQUE,
+            session_id TEXT,
+            question TEXT NOT NULL,
+            answer TEXT NOT NULL,
+            job_context TEXT,
+            status TEXT NOT NULL,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            available_at REAL NOT NULL,
+            lease_expires_at REAL,
+            result TEXT,
+            fallback INTEGER NOT NULL DEFAULT 0,
+            error TEXT,
+            created_at REAL NOT NULL,
+            updated_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_claim
+        ON evaluation_jobs (status, available_at)
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_updated ON evaluation_jobs (updated_at)')
+
+
+def idempotency_key(session_id, question, answer, job_context):
+    """Jobs with a session are unique per (session, question, answer); without one,
+    per content"""
+    if session_id:
+        parts = ('session', str(session_id), ' '.join(question.split()), ' '.join(answer.split()))
+    else:
+        parts = ('content', ' '.join(question.split()), ' '.join(answer.split()), ' '.join(job_context.split()))
+    return hashlib.sha256('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _to_dict(row):
+    if row is None:
+        return None
+    job_id, session_id, status, attempts, result, fallback, error, created_at, updated_at = row
+    return {
+        'id': job_id,
+        'session_id': session_id,
+        'status': status,
+        'attempts': attempts,
+        'evaluation': json.loads(result) if result else None,
+        'fallback': bool(fallback),
+        'error': error,
+        'created_at': created_at,
+        'updated_at': updated_at
+    }
+
+
+class JobQueue:
+    """SQLite-backed evaluation queue with an in-process worker pool.
+
+    evaluate(question, answer, job_context) must raise on failure;
+    fallback(question, answer, error) supplies the result once retries run out.
+    """
+
+    def __init__(self, evaluate, fallback, workers=4, max_attempts=3, retry_delay=2.0,
+                 lease_seconds=120.0, poll_interval=1.0, retention_seconds=7 * 24 * 3600):
+        self.evaluate = evaluate
+        self.fallback = fallback
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self.submitted = 0
+        self.deduplicated = 0
+        self.completed = 0
+        self.retried = 0
+        self.fell_back = 0
+        self._threads = []
+        self._stopping = threading.Event()
+        self._changed = threading.Condition()
+        self._lock = threading.Lock()
+        self._last_purge = 0.0
+
+    create_table = staticmethod(create_table)
+
+    def start(self):
+        """Start the worker threads; calling it again is a no-op"""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping.clear()
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._work, name=f'evaluation-job-{index}', daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def stop(self, timeout=5.0):
+        self._stopping.set()
+        self._notify()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, question, answer, job_context='', session_id=None):
+        """Queue an evaluation; returns (job, created). A duplicate submission
+        returns the existing job and created=False."""
+        now = time.time()
+        job_id = uuid.uuid4().hex
+        key = idempotency_key(session_id, question, answer, job_context)
+
+        def insert(conn):
+            inserted = conn.execute('''
+                INSERT INTO evaluation_jobs
+                    (id, idempotency_key, session_id, question, answer, job_context,
+                     status, available_at, created_at, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, 'queued', ?, ?, ?)
+                ON CONFLICT (idempotency_key) DO NOTHING
+            ''', (job_id, key, session_id, question, answer, job_context, now, now, now)).rowcount
+            existing = conn.execute(
+                'SELECT id FROM evaluation_jobs WHERE idempotency_key = ?', (key,)
+            ).fetchone()[0]
+            return existing, bool(inserted)
+        existing_id, created = storage.write(insert)
+
+        with self._lock:
+            if created:
+                self.submitted += 1
+            else:
+                self.deduplicated += 1
+        if created:
+            self._notify()
+        return self.get(existing_id), created
+
+    def get(self, job_id):
+        """Return the job as a dict, or None if it does not exist"""
+        with storage.connection() as conn:
+            return _to_dict(conn.execute(SELECT_JOB, (job_id,)).fetchone())
+
+    def wait(self, job_id, timeout):
+        """Return the job once it is done or timeout seconds have passed.
+
+        Completions in this process wake waiters at once; jobs finished by
+        another process are noticed within poll_interval."""
+        deadline = time.monotonic() + timeout
+        while True:
+            job = self.get(job_id)
+            remaining = deadline - time.monotonic()
+            if job is None or job['status'] == DONE or remaining <= 0:
+                return job
+            with self._changed:
+                self._changed.wait(min(remaining, self.poll_interval))
+
+    def stats(self):
+        with storage.connection() as conn:
+            counts = dict(conn.execute(
+                'SELECT status, COUNT(*) FROM evaluation_jobs GROUP BY status'
+            ).fetchall())
+        with self._lock:
+            return {
+                'queued': counts.get(QUEUED, 0),
+                'running': counts.get(RUNNING, 0),
+                'done': counts.get(DONE, 0),
+                'submitted': self.submitted,
+                'deduplicated': self.deduplicated,
+                'completed': self.completed,
+                'retried': self.retried,
+                'fallbacks': self.fell_back,
+                'workers': len(self._threads)
+            }
+
+    def _notify(self):
+        with self._changed:
+            self._changed.notify_all()
+
+    def _claim(self):
+        """Lease the next runnable job; returns (id, question, answer, job_context, attempt) or None"""
+        now = time.time()
+
+        def claim(conn):
+            row = conn.execute(CLAIM_JOB, (now, now)).fetchone()
+            if row is None:
+                return None
+            conn.execute('''
+                UPDATE evaluation_jobs
+                SET status = 'running', attempts = attempts + 1, lease_expires_at = ?, updated_at = ?
+                WHERE id = ?
+            ''', (now + self.lease_seconds, now, row[0]))
+            return row[:4] + (row[4] + 1,)
+        return storage.write(claim, batched=False)
+
+    def _finish(self, job_id, evaluation, fallback=False, error=None):
+        now = time.time()
+        storage.write(lambda conn: conn.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'done', result = ?, fallback = ?, error = ?, lease_expires_at = NULL, updated_at = ?
+            WHERE id = ?
+        ''', (json.dumps(evaluation), int(fallback), error, now, job_id)))
+        with self._lock:
+            self.completed += 1
+            if fallback:
+                self.fell_back += 1
+        self._notify()
+
+    def _retry_later(self, job_id, attempt, error):
+        now = time.time()
+        storage.write(lambda conn: conn.execute('''
+            UPDATE evaluation_jobs
+            SET status = 'queued', available_at = ?, error = ?, lease_expires_at = NULL, updated_at = ?
+            WHERE id = ?
+        ''', (now + self.retry_delay * 2 ** (attempt - 1), error, now, job_id)))
+        with self._lock:
+            self.retried += 1
+
+    def _run(self, job_id, question, answer, job_context, attempt):
+        try:
+            evaluation = self.evaluate(question, answer, job_context)
+        except Exception as e:
+            print(f"Error evaluating answer (job {job_id}, attempt {attempt}): {e}")
+            if attempt < self.max_attempts:
+                self._retry_later(job_id, attempt, str(e))
+            else:
+                self._finish(job_id, self.fallback(question, answer, e), fallback=True, error=str(e))
+            return
+        self._finish(job_id, evaluation)
+
+    def _purge(self):
+        """Delete finished jobs past the retention period, at most once an hour"""
+        now = time.time()
+        if now - self._last_purge < 3600:
+            return
+        self._last_purge = now
+        storage.write(lambda conn: conn.execute(
+            "DELETE FROM evaluation_jobs WHERE status = 'done' AND updated_at < ?",
+            (now - self.retention_seconds,)
+        ))
+
+    def _work(self):
+        while not self._stopping.is_set():
+            try:
+                job = self._claim()
+                if job is None:
+                    self._purge()
+                    with self._changed:
+                        self._changed.wait(self.poll_interval)
+                    continue
+                self._run(*job)
+            except Exception as e:
+                print(f"Error in evaluation job worker: {e}")
+                self._stopping.wait(self.poll_interval)
@@ -0,0 +1,325 @@
+"""Rule-based fallbacks used when the model is unavailable.
+
+Keyword tables are compiled once at import into word-boundary aware matchers,
+so each job description or answer is tokenized and scanned in a single pass.
+"""
+import re
+from collections import Counter
+
+# Technical skills
+TECH_SKILLS = {
+    'python': ['python', 'django', 'flask', 'pandas', 'numpy', 'scikit-learn'],
+    'javascript': ['javascript', 'js', 'node.js', 'react', 'angular', 'vue', 'typescript'],
+    'java': ['java', 'spring', 'hibernate', 'maven', 'gradle'],
+    'c#': ['c#', '.net', 'asp.net', 'entity framework'],
+    'sql': ['sql', 'mysql', 'postgresql', 'oracle', 'mongodb', 'database'],
+    'aws': ['aws', 'amazon web services', 'ec2', 's3', 'lambda', 'cloud'],
+    'azure': ['azure', 'microsoft azure', 'cloud'],
+    'docker': ['docker', 'containerization', 'kubernetes', 'k8s'],
+    'git': ['git', 'github', 'gitlab', 'version control'],
+    'agile': ['agile', 'scrum', 'kanban', 'sprint', 'sprint planning'],
+    'ci/cd': ['ci/cd', 'jenkins', 'github actions', 'gitlab ci', 'pipeline'],
+    'machine learning': ['machine learning', 'ml', 'ai', 'artificial intelligence', 'deep learning'],
+    'data science': ['data science', 'data analysis', 'statistics', 'analytics'],
+    'devops': ['devops', 'deployment', 'infrastructure', 'terraform', 'ansible'],
+    'frontend': ['html', 'css', 'bootstrap', 'tailwind', 'responsive design'],
+    'backend': ['api', 'rest', 'graphql', 'microservices', 'server-side'],
+    'mobile': ['ios', 'android', 'react native', 'flutter', 'mobile development'],
+    'testing': ['testing', 'unit testing', 'integration testing', 'qa', 'quality assurance']
+}
+
+# Soft skills
+SOFT_SKILLS = {
+    'communication': ['communication', 'verbal', 'written', 'presentation'],
+    'leadership': ['leadership', 'lead', 'manage', 'management', 'team lead'],
+    'teamwork': ['teamwork', 'collaboration', 'team player', 'cross-functional'],
+    'problem solving': ['problem solving', 'analytical', 'critical thinking', 'troubleshooting'],
+    'time management': ['time management', 'prioritization', 'deadline'],
+    'adaptability': ['adaptability', 'flexible', 'learning', 'quick learner'],
+    'attention to detail': ['attention to detail', 'detail-oriented', 'accuracy'],
+    'creativity': ['creativity', 'innovative', 'creative thinking'],
+    'customer service': ['customer service', 'client-facing', 'stakeholder'],
+    'project management': ['project management', 'planning', 'coordination']
+}
+
+# Experience levels
+EXPERIENCE_KEYWORDS = ['junior', 'senior', 'lead', 'principal', 'architect', 'entry-level', 'mid-level']
+
+DEFAULT_SKILLS = ['General Programming', 'Problem Solving', 'Communication']
+
+# Answer quality indicators
+QUALITY_INDICATORS = {
+    'technical_terms': ['api', 'database', 'algorithm', 'framework', 'library', 'deployment',
+                        'testing', 'debugging', 'optimization', 'architecture'],
+    'examples': ['for example', 'e.g.', 'such as', 'like', 'instance'],
+    'structure': ['first', 'second', 'third', 'finally', 'then', 'next', 'also', 'additionally'],
+    'experience': ['worked', 'experience', 'implemented', 'developed', 'created', 'built', 'designed']
+}
+
+
+# Punctuation that never belongs to a keyword; "." "#" "+" "/" "-" are kept so
+# tokens like "node.js", "c#", "ci/cd" and "scikit-learn" survive intact.
+_TO_SPACE = str.maketrans({c: ' ' for c in '!"$%&\'()*,:;<=>?@[\\]^_`{|}~\t\r\n'})
+_COMPOUND_SEPARATORS = re.compile(r'[./-]')
+
+
+def _tokenize(text):
+    """Lowercase and split text into words, dropping sentence-ending periods"""
+    return (text.lower().translate(_TO_SPACE) + ' ').replace('. ', ' ').split()
+
+
+class KeywordMatcher:
+    """Whole-word keyword and phrase matcher compiled once and reused.
+
+    Text is tokenized a single time; single-word keywords are resolved with a
+    set intersection and multi-word phrases are only searched for when all of
+    their words occur. Compound tokens ("python/django", "ai-driven") also
+    count as each of their parts.
+    """
+
+    def __init__(self, keywords):
+        self.words = {}
+        self.phrases = {}
+        for keyword in keywords:
+            normalized = keyword.rstrip('.')
+            parts = normalized.split()
+            if len(parts) == 1:
+                self.words.setdefault(normalized, []).append(keyword)
+            else:
+                self.phrases.setdefault(normalized, (parts, []))[1].append(keyword)
+
+    def _expand(self, tokens, add):
+        for token in [t for t in tokens if _COMPOUND_SEPARATORS.search(t)]:
+            for part in _COMPOUND_SEPARATORS.split(token):
+                if part and part != token:
+                    add(token, part)
+
+    def find(self, text):
+        """Return the set of keywords present in text"""
+        words = _tokenize(text)
+        tokens = set(words)
+        self._expand(list(tokens), lambda token, part: tokens.add(part))
+
+        found = set()
+        for word in tokens.intersection(self.words):
+            found.update(self.words[word])
+        joined = None
+        for phrase, (parts, keywords) in self.phrases.items():
+            if tokens.issuperset(parts):
+                if joined is None:
+                    joined = ' ' + ' '.join(words) + ' '
+                if f' {phrase} ' in joined:
+                    found.update(keywords)
+        return found
+
+    def count(self, text):
+        """Return a Counter of keyword occurrences in text"""
+        words = _tokenize(text)
+        tokens = Counter(words)
+
+        def add(token, part):
+            tokens[part] += tokens[token]
+        self._expand(list(tokens), add)
+
+        counts = Counter()
+        for word in tokens.keys() & self.words.keys():
+            for keyword in self.words[word]:
+                counts[keyword] += tokens[word]
+        joined = None
+        for phrase, (parts, keywords) in self.phrases.items():
+            if all(part in tokens for part in parts):
+                if joined is None:
+                    joined = ' ' + ' '.join(words) + ' '
+                occurrences = joined.count(f' {phrase} ')
+                for keyword in keywords:
+                    counts[keyword] += occurrences
+        return counts
+
+
+def _build_skill_labels():
+    """Map each skill keyword to its labels and give every label a stable rank"""
+    labels_by_keyword = {}
+    label_order = {}
+    for table in (TECH_SKILLS, SOFT_SKILLS):
+        for category, keywords in table.items():
+            label = category.title()
+            label_order.setdefault(label, len(label_order))
+            for keyword in keywords:
+                labels_by_keyword.setdefault(keyword, []).append(label)
+    for keyword in EXPERIENCE_KEYWORDS:
+        label = f"{keyword.title()} Level"
+        label_order.setdefault(label, len(label_order))
+        labels_by_keyword.setdefault(keyword, []).append(label)
+    return labels_by_keyword, label_order
+
+
+_SKILL_LABELS, _SKILL_ORDER = _build_skill_labels()
+_SKILL_MATCHER = KeywordMatcher(_SKILL_LABELS)
+
+_INDICATOR_BY_KEYWORD = {
+    keyword: name for name, keywords in QUALITY_INDICATORS.items() for keyword in keywords
+}
+_INDICATOR_MATCHER = KeywordMatcher(_INDICATOR_BY_KEYWORD)
+
+
+def get_fallback_skills(job_description):
+    """Enhanced fallback skill extraction"""
+    found = set()
+    for keyword in _SKILL_MATCHER.find(job_description):
+        found.update(_SKILL_LABELS[keyword])
+    if not found:
+        return list(DEFAULT_SKILLS)
+    return sorted(found, key=_SKILL_ORDER.__getitem__)
+
+
+def quality_indicators(answer):
+    """Count each answer quality indicator from a single tokenization"""
+    indicators = dict.fromkeys(QUALITY_INDICATORS, 0)
+    for keyword, occurrences in _INDICATOR_MATCHER.count(answer).items():
+        indicators[_INDICATOR_BY_KEYWORD[keyword]] += occurrences
+    return indicators
+
+
+# Fallback technical questions, keyed by a substring of the skill they cover
+TECH_QUESTIONS = {
+    'python': "Can you explain the difference between lists and tuples in Python, and when would you use each?",
+    'javascript': "How does JavaScript handle asynchronous operations, and what are the different ways to work with async code?",
+    'react': "Explain the concept of React hooks and how they differ from class components.",
+    'sql': "How would you optimize a slow-performing SQL query? Walk me through your approach.",
+    'aws': "Describe the key AWS services you've worked with and how you would architect a scalable web application.",
+    'docker': "Explain the benefits of containerization and how Docker differs from traditional virtualization.",
+    'machine learning': "Walk me through the steps you would take to build and deploy a machine learning model.",
+    'api': "How would you design a RESTful API? What are the key principles you would follow?",
+    'testing': "What testing strategies do you use to ensure code quality? How do you approach unit vs integration testing?"
+}
+
+# Technical questions that fit any role, for skills without a specific one
+GENERAL_TECH_QUESTIONS = [
+    "Can you describe your experience with the technologies mentioned in this role?",
+    "Walk me through how you would debug a production issue you could not reproduce locally.",
+    "How do you decide between building a component yourself and adopting an existing library or service?",
+    "Describe the architecture of a system you built recently and the trade-offs you made."
+]
+
+# (question, skill) pairs; the first two make up the default set
+BEHAVIORAL_QUESTIONS = [
+    ("Tell me about a challenging technical problem you solved recently. What was your approach?", "Problem Solving"),
+    ("Describe a situation where you had to work with a difficult team member. How did you handle it?", "Communication"),
+    ("How do you stay updated with the latest technologies and industry trends?", "Continuous Learning"),
+    ("Tell me about a project where you had to learn a new technology quickly. How did you approach it?", "Adaptability"),
+    ("Describe a time when you had to explain a complex technical concept to a non-technical stakeholder.", "Communication")
+]
+
+
+def generate_fallback_questions(skills, difficulty_level):
+    """Generate fallback questions based on extracted skills"""
+    questions = []
+    
+    # Add technical questions based on skills
+    tech_count = 0
+    for skill in skills:
+        skill_lower = skill.lower()
+        for tech_skill, question in TECH_QUESTIONS.items():
+            if tech_skill in skill_lower and tech_count < 3:
+                questions.append({
+                    "question": question,
+                    "type": "technical",
+                    "skill": skill
+                })
+                tech_count += 1
+                break
+    
+    # Add behavioral questions
+    for question, skill in BEHAVIORAL_QUESTIONS[:2]:
+        questions.append({
+            "question": question,
+            "type": "behavioral",
+            "skill": skill
+        })
+    
+    # Ensure we have 5 questions
+    while len(questions) < 5:
+        questions.append({
+            "question": GENERAL_TECH_QUESTIONS[0],
+            "type": "technical",
+            "skill": "General"
+        })
+    
+    return questions[:5]
+
+
+def fallback_question_pool(skills):
+    """Every distinct fallback question for the skills, best matches first:
+    technical ones for matching skills, then general technical, then behavioral"""
+    pool = []
+    for skill in skills:
+        skill_lower = str(skill).lower()
+        for tech_skill, question in TECH_QUESTIONS.items():
+            if tech_skill in skill_lower:
+                pool.append({"question": question, "type": "technical", "skill": skill})
+                break
+    pool += [{"question": question, "type": "technical", "skill": "General"} for question in GENERAL_TECH_QUESTIONS]
+    pool += [{"question": question, "type": "behavioral", "skill": skill} for question, skill in BEHAVIORAL_QUESTIONS]
+    return pool
+
+
+def generate_fallback_evaluation(answer, question):
+    """Generate more dynamic fallback evaluation based on answer quality"""
+    answer_words = len(answer.split())
+    
+    # Base scoring logic
+    if answer_words < 20:
+        base_score = 3  # Very short answer
+    elif answer_words < 50:
+        base_score = 5  # Short answer
+    elif answer_words < 100:
+        base_score = 6  # Medium answer
+    elif answer_words < 200:
+        base_score = 7  # Good length
+    else:
+        base_score = 8  # Comprehensive answer
+    
+    # Adjust based on content quality indicators
+    indicators = quality_indicators(answer)
+    
+    # Calculate bonus points
+    bonus = min(2, sum(indicators.values()) * 0.3)
+    final_score = min(10, base_score + bonus)
+    
+    # Generate dimension scores with some variation
+    technical_accuracy = max(1, min(10, final_score + (1 if 'technical' in question.lower() else -1)))
+    communication_clarity = max(1, min(10, final_score + (1 if indicators['structure'] > 0 else -1)))
+    depth_of_knowledge = max(1, min(10, final_score + (1 if indicators['technical_terms'] > 2 else -1)))
+    contextual_understanding = max(1, min(10, final_score + (1 if indicators['experience'] > 0 else -1)))
+    problem_solving = max(1, min(10, final_score + (1 if indicators['examples'] > 0 else -1)))
+    
+    # Generate feedback based on score
+    if final_score >= 8:
+        feedback = "Excellent response! You demonstrated strong technical knowledge and clear communication."
+        strengths = ["Strong technical understanding", "Clear communication", "Good examples provided"]
+        improvements = ["Consider adding more specific technical details"]
+    elif final_score >= 6:
+        feedback = "Good response with room for improvement. Consider adding more specific examples and technical details."
+        strengths = ["Basic understanding shown", "Clear communication"]
+        improvements = ["Add more specific examples", "Include technical details", "Provide more context"]
+    else:
+        feedback = "This answer needs significant improvement. Consider providing more detailed responses with specific examples."
+        strengths = ["Attempted to answer the question"]
+        improvements = ["Provide more detailed responses", "Include specific examples", "Add technical context", "Structure your answer better"]
+    
+    return {
+        "overall_score": round(final_score, 1),
+        "technical_accuracy": round(technical_accuracy, 1),
+        "communication_clarity": round(communication_clarity, 1),
+        "depth_of_knowledge": round(depth_of_knowledge, 1),
+        "contextual_understanding": round(contextual_understanding, 1),
+        "problem_solving": round(problem_solving, 1),
+        "feedback": feedback,
+        "strengths": strengths,
+        "improvements": improvements
+    }
+
+
+def generate_fallback_evaluations(items):
+    """Score many (question, answer) pairs at once, preserving order"""
+    return [generate_fallback_evaluation(answer, question) for question, answer in items]
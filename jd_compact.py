@@ -0,0 +1,108 @@
+"""Shrink a job description before it is sent to the model.
+
+Postings carry a lot of text that does not affect skill extraction or
+question generation: benefits, equal-opportunity statements, company blurbs,
+bullets repeated between sections and layout whitespace. compact() drops
+those, then caps what is left to a token budget so a pasted novel cannot
+blow up prompt cost.
+"""
+import re
+
+# Rough OpenAI tokenizer ratio for English prose; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+# Headings that open a section with nothing the model needs
+_BOILERPLATE_HEADING = re.compile(
+    r'^(about (?!(the )?(role|position|job|opportunity|you)\b)[a-z0-9&.\- ]{1,40}|who we are|'
+    r'our (story|mission|values|culture)|(benefits|perks)( (and|&) (perks|benefits))?|what we offer|'
+    r'why (join us|work (with|for) us)|compensation( and benefits)?|equal (employment )?opportunity|'
+    r'eeo( statement)?|diversity[a-z ,&]*|accommodations?|privacy( notice)?|how to apply|application process)$'
+)
+# Boilerplate sentences that also turn up outside their own section
+_BOILERPLATE_SENTENCE = re.compile(
+    r'equal opportunity employer|without regard to (race|age|gender)|reasonable accommodation|'
+    r'e-verify|affirmative action|protected veteran|sexual orientation|'
+    r'we (do not|don\'t) accept unsolicited|recruitment agencies'
+)
+# Words that mark the start of a section about the job itself
+_CONTENT_HEADING = re.compile(
+    r'\b(role|position|job|opportunity|responsibilit|requirement|qualification|skills|experience|'
+    r'duties|you will|you\'ll|what you|who you|looking for|candidate|day to day|tech stack|must have|'
+    r'nice to have|the team|overview|summary)'
+)
+_SENTENCE_BREAK = re.compile(r'(?<=[.!?])\s+')
+_BULLET = re.compile(r'^\s*(?:[-*\u2022\u25cf\u25aa\u2023\u2043]|\d+[.)])\s*')
+_HEADING_MARKUP = re.compile(r'^#+\s*|^\*\*|\*\*$|:$')
+_SPACES = re.compile(r'[ \t\u00a0]+')
+
+
+def estimate_tokens(text):
+    """Approximate token count of a piece of text"""
+    return (len(text or '') + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def _dedupe_key(line):
+    return re.sub(r'[^a-z0-9+#]+', ' ', _BULLET.sub('', line).lower()).strip()
+
+
+def _plain_heading(line):
+    """Whether an unmarked line reads like a heading about the job (pasted
+    postings often lose their markup): a few words naming part of the job,
+    without sentence punctuation"""
+    if len(line.split()) > 6 or line[-1] in '.!?,;':
+        return False
+    return bool(_CONTENT_HEADING.search(line.lower()))
+
+
+def _heading(line):
+    """Return the normalized heading text if line looks like a section heading"""
+    # **Bold** headings start like a * bullet
+    if (_BULLET.match(line) and not line.startswith('**')) or len(line) > 60:
+        return None
+    text = _HEADING_MARKUP.sub('', line).strip().lower()
+    marked = line.endswith(':') or line.startswith('#') or line.startswith('**') or line.isupper()
+    if marked or _BOILERPLATE_HEADING.match(text) or _plain_heading(line):
+        return text
+    return None
+
+
+def compact(job_description, max_tokens=1500):
+    """Return the job description without boilerplate, duplicate lines and
+    extra whitespace, cut at a line boundary to about max_tokens"""
+    lines = []
+    seen = set()
+    skipping = False
+    for raw in (job_description or '').splitlines():
+        line = _SPACES.sub(' ', raw).strip()
+        if not line:
+            continue
+        heading = _heading(line)
+        if heading is not None:
+            skipping = bool(_BOILERPLATE_HEADING.match(heading))
+        if skipping:
+            continue
+        if _BOILERPLATE_SENTENCE.search(line.lower()):
+            line = ' '.join(
+                sentence for sentence in _SENTENCE_BREAK.split(line)
+                if not _BOILERPLATE_SENTENCE.search(sentence.lower())
+            )
+        key = _dedupe_key(line)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        lines.append(line)
+    if not lines:
+        # Everything looked like boilerplate; better to send it than nothing
+        lines = [' '.join((job_description or '').split())]
+
+    budget = max_tokens * CHARS_PER_TOKEN
+    kept = []
+    used = 0
+    for line in lines:
+        if used + len(line) + 1 > budget:
+            if not kept:
+                kept.append(line[:budget])
+            break
+        kept.append(line)
+        used += len(line) + 1
+    return '\n'.join(kept)
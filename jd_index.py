@@ -0,0 +1,223 @@
+"""Near-duplicate index over previously seen job descriptions.
+
+The same posting often comes back with small edits (a different company
+blurb, reordered bullets, extra whitespace) that defeat the exact-match
+cache. Each description is reduced to a MinHash signature over word
+shingles; signatures are split into LSH bands so that only descriptions
+sharing at least one band are compared. A candidate whose estimated Jaccard
+similarity clears the threshold has its stored skills and questions reused.
+
+Signatures are persisted in SQLite and loaded into memory at startup.
+"""
+import array
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from collections import deque
+
+import storage
+
+NUM_PERM = 128
+BAND_ROWS = 4
+BANDS = NUM_PERM // BAND_ROWS
+SHINGLE_SIZE = 3
+
+# Changing the seed or NUM_PERM invalidates every stored signature
+_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_WORD = re.compile(r'[a-z0-9+#]+')
+
+
+def shingles(text):
+    """Hashed word shingles of a job description.
+
+    Shingles never span lines, so reordering bullets leaves the set unchanged.
+    """
+    hashes = set()
+    for line in (text or '').lower().splitlines():
+        words = _WORD.findall(line)
+        if len(words) < SHINGLE_SIZE:
+            grams = [' '.join(words)] if words else []
+        else:
+            grams = (' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1))
+        hashes.update(zlib.crc32(gram.encode('utf-8')) for gram in grams)
+    return hashes
+
+
+def signature(text):
+    """MinHash signature of a job description, or None if it has no words"""
+    hashes = shingles(text)
+    if not hashes:
+        return None
+    return tuple(min((a * h + b) % _PRIME for h in hashes) for a, b in _PERMUTATIONS)
+
+
+def similarity(first, second):
+    """Estimated Jaccard similarity of two signatures"""
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+
+def _bands(sig):
+    return [hash(sig[i:i + BAND_ROWS]) for i in range(0, NUM_PERM, BAND_ROWS)]
+
+
+def questions_key(skills, difficulty):
+    """Key under which questions for a skill list and difficulty are stored"""
+    skill_keys = sorted(' '.join(str(skill).lower().split()) for skill in skills)
+    return json.dumps([' '.join(str(difficulty).lower().split()), skill_keys])
+
+
+class Match:
+    """A stored job description similar to the one looked up"""
+
+    def __init__(self, entry_id, similarity, skills, questions):
+        self.id = entry_id
+        self.similarity = similarity
+        self.skills = skills
+        self.questions = questions
+
+
+class JDIndex:
+    """In-memory MinHash/LSH index backed by the jd_index table"""
+
+    def __init__(self, threshold=0.8, seed_threshold=0.6, latency_samples=1000):
+        self.threshold = threshold
+        self.seed_threshold = seed_threshold
+        self._entries = {}
+        self._buckets = [{} for _ in range(BANDS)]
+        self._hashes = {}
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=latency_samples)
+        self.lookups = 0
+        self.matches = 0
+        self.seeds = 0
+
+    def create_table(self, conn):
+        """Create the backing table on an open connection"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS jd_index (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                jd_hash TEXT NOT NULL UNIQUE,
+                signature BLOB NOT NULL,
+                skills TEXT NOT NULL,
+                questions TEXT NOT NULL DEFAULT '{}',
+                created_at REAL NOT NULL
+            )
+        ''')
+
+    def _remember(self, entry_id, jd_hash, sig, skills, questions):
+        # Caller must hold self._lock
+        self._entries[entry_id] = (sig, skills, questions)
+        self._hashes[jd_hash] = entry_id
+        for band, bucket in zip(_bands(sig), self._buckets):
+            bucket.setdefault(band, []).append(entry_id)
+
+    def load(self):
+        """Load every stored signature into memory"""
+        with storage.connection() as conn:
+            rows = conn.execute(
+                'SELECT id, jd_hash, signature, skills, questions FROM jd_index'
+            ).fetchall()
+        with self._lock:
+            self._entries.clear()
+            self._hashes.clear()
+            self._buckets = [{} for _ in range(BANDS)]
+            for entry_id, jd_hash, blob, skills, questions in rows:
+                sig = tuple(array.array('Q', blob))
+                if len(sig) == NUM_PERM:
+                    self._remember(entry_id, jd_hash, sig, json.loads(skills), json.loads(questions))
+        return len(rows)
+
+    def lookup(self, job_description):
+        """Return (match, signature) for the most similar stored description.
+
+        match is None unless the best candidate reaches seed_threshold; callers
+        reuse it outright at threshold and only seed from it below that.
+        """
+        started = time.perf_counter()
+        sig = signature(job_description)
+        best = None
+        if sig is not None:
+            with self._lock:
+                candidates = set()
+                for band, bucket in zip(_bands(sig), self._buckets):
+                    candidates.update(bucket.get(band, ()))
+                for entry_id in candidates:
+                    stored_sig, skills, questions = self._entries[entry_id]
+                    score = similarity(sig, stored_sig)
+                    if score >= self.seed_threshold and (best is None or score > best.similarity):
+                        best = Match(entry_id, score, skills, dict(questions))
+        with self._lock:
+            self.lookups += 1
+            if best is not None:
+                if best.similarity >= self.threshold:
+                    self.matches += 1
+                else:
+                    self.seeds += 1
+            self._latencies.append((time.perf_counter() - started) * 1000)
+        return best, sig
+
+    def add(self, job_description, sig, skills):
+        """Store a description's signature and skills; returns its entry id.
+
+        A description that is already stored keeps its original skills.
+        """
+        if sig is None:
+            return None
+        jd_hash = hashlib.sha256(' '.join(job_description.lower().split()).encode('utf-8')).hexdigest()
+        blob = array.array('Q', sig).tobytes()
+        now = time.time()
+
+        def insert(conn):
+            conn.execute('''
+                INSERT INTO jd_index (jd_hash, signature, skills, created_at)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(jd_hash) DO NOTHING
+            ''', (jd_hash, blob, json.dumps(skills), now))
+            return conn.execute(
+                'SELECT id, skills, questions FROM jd_index WHERE jd_hash = ?', (jd_hash,)
+            ).fetchone()
+        entry_id, stored_skills, questions = storage.write(insert)
+        with self._lock:
+            if jd_hash not in self._hashes:
+                self._remember(entry_id, jd_hash, sig, json.loads(stored_skills), json.loads(questions))
+        return entry_id
+
+    def add_questions(self, entry_id, skills, difficulty, questions):
+        """Attach generated questions to a stored description"""
+        with self._lock:
+            entry = self._entries.get(entry_id)
+            if entry is None:
+                return
+            stored = dict(entry[2])
+            stored[questions_key(skills, difficulty)] = questions
+            self._entries[entry_id] = (entry[0], entry[1], stored)
+        storage.write(lambda conn: conn.execute(
+            'UPDATE jd_index SET questions = ? WHERE id = ?', (json.dumps(stored), entry_id)
+        ))
+
+    def stats(self):
+        """Return match rate and lookup latency for a health/metrics payload"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            lookups = self.lookups
+
+            def percentile(p):
+                if not latencies:
+                    return 0.0
+                return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+            return {
+                'entries': len(self._entries),
+                'lookups': lookups,
+                'matches': self.matches,
+                'seeded': self.seeds,
+                'match_rate': round(self.matches / lookups, 3) if lookups else 0.0,
+                'lookup_ms_p50': percentile(0.5),
+                'lookup_ms_p95': percentile(0.95)
+            }
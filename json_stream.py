@@ -0,0 +1,93 @@
+"""Incremental JSON parsing for streamed model output.
+
+The model returns either a JSON array (questions) or a JSON object
+(evaluation). StreamingJSONParser is fed text chunks as they arrive and
+reports each top-level array element or object member as soon as it is
+complete, so callers can forward it before the whole response is finished.
+"""
+import json
+
+
+class StreamingJSONParser:
+    """Report completed top-level elements of a JSON array or object"""
+
+    def __init__(self):
+        self.text = ''
+        self.pos = 0
+        self.depth = 0
+        self.in_string = False
+        self.escape = False
+        self.start = None
+        self.container = None
+        self.done = False
+        self.items = []
+
+    def feed(self, chunk):
+        """Consume a chunk and return the items completed by it.
+
+        Array elements are returned as decoded values; object members as
+        (key, value) tuples. Text before the opening bracket, such as a
+        Markdown code fence, is ignored.
+        """
+        self.text += chunk
+        completed = []
+        text = self.text
+        for i in range(self.pos, len(text)):
+            if self.done:
+                break
+            char = text[i]
+
+            if self.depth == 0:
+                if char in '[{':
+                    self.container = char
+                    self.depth = 1
+                    self.start = i + 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif char == '\\':
+                    self.escape = True
+                elif char == '"':
+                    self.in_string = False
+                continue
+
+            if char == '"':
+                self.in_string = True
+            elif char in '[{':
+                self.depth += 1
+            elif char in ']}':
+                self.depth -= 1
+                if self.depth == 1:
+                    # A nested value just closed: the element/member is complete
+                    self._complete(text[self.start:i + 1], completed)
+                    self.start = None
+                elif self.depth == 0:
+                    if self.start is not None:
+                        self._complete(text[self.start:i], completed)
+                    self.done = True
+            elif char == ',' and self.depth == 1:
+                if self.start is not None:
+                    self._complete(text[self.start:i], completed)
+                self.start = i + 1
+        self.pos = len(text)
+        return completed
+
+    def _complete(self, segment, completed):
+        if not segment.strip():
+            return
+        if self.container == '[':
+            item = json.loads(segment)
+        else:
+            item = next(iter(json.loads('{' + segment + '}').items()))
+        self.items.append(item)
+        completed.append(item)
+
+    def result(self):
+        """Return the fully parsed value; raises JSONDecodeError if incomplete"""
+        if not self.done:
+            raise json.JSONDecodeError("Incomplete JSON in model response", self.text, len(self.text))
+        if self.container == '[':
+            return list(self.items)
+        return dict(self.items)
@@ -0,0 +1,194 @@
+"""Content-addressed cache for model responses.
+
+Entries are kept in an in-process LRU and written through to a SQLite table
+so they survive restarts. Expired rows are deleted in the background of
+writes, at most once per purge interval, so the table does not grow without
+bound. Concurrent misses for the same key are coalesced
+(singleflight) so only one caller pays for the upstream call.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Collapse whitespace and case so trivially different inputs share a key"""
+    return re.sub(r'\s+', ' ', text or '').strip().lower()
+
+
+def make_key(namespace, *parts):
+    """Build a stable hash key from a namespace and JSON-serializable parts"""
+    payload = json.dumps([namespace, *parts], ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class _InFlight:
+    """A pending computation that other callers can wait on"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class LLMCache:
+    """LRU + SQLite cache with TTL, hit/miss counters and singleflight"""
+
+    def __init__(self, connection, max_entries=1024, ttl_seconds=7 * 24 * 3600, purge_interval=3600):
+        """connection is a context manager factory yielding an autocommit connection"""
+        self.connection = connection
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.purge_interval = purge_interval
+        self.purged = 0
+        self._last_purge = 0.0
+        self._entries = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def create_table(self, conn):
+        """Create the backing table on an open connection"""
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_created_at ON llm_cache (created_at)')
+
+    def _is_fresh(self, created_at):
+        return self.ttl_seconds <= 0 or time.time() - created_at < self.ttl_seconds
+
+    def _remember(self, key, value, created_at):
+        # Caller must hold self._lock
+        self._entries[key] = (value, created_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        with self.connection() as conn:
+            row = conn.execute(
+                'SELECT value, created_at FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if not self._is_fresh(row[1]):
+                conn.execute('DELETE FROM llm_cache WHERE key = ?', (key,))
+                return None
+            return json.loads(row[0]), row[1]
+
+    def _store(self, key, value, created_at):
+        with self.connection() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO llm_cache (key, value, created_at) VALUES (?, ?, ?)',
+                (key, json.dumps(value), created_at)
+            )
+        self._purge(created_at)
+
+    def _purge(self, now):
+        """Delete expired rows, at most once per purge_interval"""
+        if self.ttl_seconds <= 0:
+            return
+        with self._lock:
+            if now - self._last_purge < self.purge_interval:
+                return
+            self._last_purge = now
+        with self.connection() as conn:
+            deleted = conn.execute(
+                'DELETE FROM llm_cache WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).rowcount
+        with self._lock:
+            self.purged += deleted
+
+    def get(self, key):
+        """Return the cached value for key, or None on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if self._is_fresh(entry[1]):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[0]
+                del self._entries[key]
+
+        try:
+            stored = self._load(key)
+        except sqlite3.Error as e:
+            print(f"Error reading cache: {e}")
+            stored = None
+
+        with self._lock:
+            if stored is None:
+                self.misses += 1
+                return None
+            self._remember(key, *stored)
+            self.hits += 1
+            return stored[0]
+
+    def set(self, key, value):
+        """Store value under key in memory and SQLite"""
+        created_at = time.time()
+        with self._lock:
+            self._remember(key, value, created_at)
+        try:
+            self._store(key, value, created_at)
+        except sqlite3.Error as e:
+            print(f"Error writing cache: {e}")
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value or run compute() once for all concurrent callers.
+
+        Exceptions raised by compute() propagate to every waiting caller and
+        nothing is cached, so failures are retried on the next request.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        with self._lock:
+            call = self._in_flight.get(key)
+            leader = call is None
+            if leader:
+                call = self._in_flight[key] = _InFlight()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = compute()
+            self.set(key, call.value)
+            return call.value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+            call.event.set()
+
+    def stats(self):
+        """Return counters suitable for a health/metrics payload"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'purged': self.purged,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0
+            }
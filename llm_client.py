@@ -0,0 +1,294 @@
+"""Shared OpenAI client with deadlines, retries and a circuit breaker.
+
+One pooled HTTP client is reused for every model call so connections stay
+alive between requests. Each call gets an overall deadline that covers all
+of its retries, transient errors are retried with jittered backoff, and a
+circuit breaker fails fast while the upstream is down so callers can go
+straight to their fallback path. A global limiter caps concurrent upstream
+calls and bounds how many may wait for a slot; beyond that calls fail fast
+with UpstreamBusyError instead of piling up.
+
+openai and httpx are imported on the first model call rather than at import
+time; together they are most of the app's startup cost.
+"""
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+import metrics
+
+MODEL = os.getenv('OPENAI_MODEL', 'gpt-3.5-turbo')
+DEFAULT_DEADLINE_SECONDS = float(os.getenv('LLM_DEADLINE_SECONDS', 20))
+MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 2))
+CIRCUIT_FAILURE_THRESHOLD = int(os.getenv('LLM_CIRCUIT_FAILURE_THRESHOLD', 5))
+CIRCUIT_RESET_SECONDS = float(os.getenv('LLM_CIRCUIT_RESET_SECONDS', 30))
+MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 64))
+# One keep-alive connection per upstream slot unless set explicitly
+MAX_CONNECTIONS = int(os.getenv('LLM_MAX_CONNECTIONS', MAX_CONCURRENCY))
+MAX_QUEUE = int(os.getenv('LLM_MAX_QUEUE', 256))
+QUEUE_TIMEOUT_SECONDS = float(os.getenv('LLM_QUEUE_TIMEOUT_SECONDS', 5))
+
+BACKOFF_BASE_SECONDS = 0.25
+BACKOFF_MAX_SECONDS = 4.0
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the circuit is open"""
+
+
+class UpstreamBusyError(Exception):
+    """Raised when the admission queue for upstream calls is full or a slot
+    does not free up in time"""
+
+
+class ConcurrencyLimiter:
+    """Caps in-flight upstream calls, with a bounded queue of waiting callers"""
+
+    def __init__(self, max_concurrency, max_queue, queue_timeout):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.rejected = 0
+        self._slots = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+
+    def saturated(self):
+        """True when new calls would be rejected immediately"""
+        with self._lock:
+            return self.active >= self.max_concurrency and self.waiting >= self.max_queue
+
+    @contextmanager
+    def slot(self, timeout=None):
+        """Hold one upstream slot; raises UpstreamBusyError if none is available"""
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                if self.waiting >= self.max_queue:
+                    self.rejected += 1
+                    raise UpstreamBusyError("Upstream admission queue is full")
+                self.waiting += 1
+            try:
+                wait = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+                acquired = self._slots.acquire(timeout=wait)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+            if not acquired:
+                with self._lock:
+                    self.rejected += 1
+                raise UpstreamBusyError("Timed out waiting for an upstream slot")
+        with self._lock:
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.active -= 1
+            self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'active': self.active,
+                'waiting': self.waiting,
+                'rejected': self.rejected,
+                'max_concurrency': self.max_concurrency,
+                'max_queue': self.max_queue
+            }
+
+
+class CircuitBreaker:
+    """Opens after consecutive failures and lets one probe through after a cooldown"""
+
+    def __init__(self, failure_threshold, reset_seconds):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.failures = 0
+        self.opened_at = None
+        self.probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            if self.opened_at is None:
+                return 'closed'
+            if time.monotonic() - self.opened_at >= self.reset_seconds:
+                return 'half-open'
+            return 'open'
+
+    def allow(self):
+        """Return True if a call may go upstream now"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if self.probing or time.monotonic() - self.opened_at < self.reset_seconds:
+                return False
+            self.probing = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.probing or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.probing = False
+
+
+breaker = CircuitBreaker(CIRCUIT_FAILURE_THRESHOLD, CIRCUIT_RESET_SECONDS)
+limiter = ConcurrencyLimiter(MAX_CONCURRENCY, MAX_QUEUE, QUEUE_TIMEOUT_SECONDS)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """Return the process-wide OpenAI client, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                import httpx
+                import openai
+
+                http_client = httpx.Client(
+                    limits=httpx.Limits(
+                        max_connections=MAX_CONNECTIONS,
+                        max_keepalive_connections=MAX_CONNECTIONS
+                    )
+                )
+                # Retries are handled here so they share the call's deadline
+                _client = openai.OpenAI(
+                    api_key=os.getenv('OPENAI_API_KEY'),
+                    http_client=http_client,
+                    max_retries=0
+                )
+    return _client
+
+
+def client_initialized():
+    return _client is not None
+
+
+def _backoff(attempt):
+    """Full-jitter exponential backoff"""
+    return random.uniform(0, min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+
+def _call(request, deadline):
+    """Run request(timeout) with retries and the circuit breaker"""
+    import openai
+
+    transient_errors = (
+        openai.APITimeoutError,
+        openai.APIConnectionError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+    if not breaker.allow():
+        raise CircuitOpenError("Model circuit is open")
+
+    expires_at = time.monotonic() + (deadline or DEFAULT_DEADLINE_SECONDS)
+    attempt = 0
+    while True:
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            breaker.record_failure()
+            raise TimeoutError("Model call deadline exceeded")
+        try:
+            result = request(remaining)
+        except openai.BadRequestError:
+            # The upstream answered; the request itself was rejected
+            breaker.record_success()
+            raise
+        except transient_errors:
+            delay = _backoff(attempt)
+            if attempt >= MAX_RETRIES or time.monotonic() + delay >= expires_at:
+                breaker.record_failure()
+                raise
+            attempt += 1
+            time.sleep(delay)
+            continue
+        except Exception:
+            breaker.record_failure()
+            raise
+        breaker.record_success()
+        return result
+
+
+@contextmanager
+def _observed(helper):
+    """Record the duration and outcome of an upstream call for metrics"""
+    started = time.perf_counter()
+    outcome = 'ok'
+    try:
+        yield
+    except UpstreamBusyError:
+        outcome = 'busy'
+        raise
+    except CircuitOpenError:
+        outcome = 'circuit_open'
+        raise
+    except Exception:
+        outcome = 'error'
+        raise
+    finally:
+        metrics.LLM_REQUEST_SECONDS.observe(time.perf_counter() - started, helper=helper, outcome=outcome)
+
+
+def chat_completion(messages, max_tokens, temperature, deadline=None, helper='chat'):
+    """Return the text of a chat completion; raises on failure, open circuit
+    or a full admission queue. helper labels the call in metrics."""
+    with _observed(helper), limiter.slot(deadline):
+        response = _call(
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout
+            ),
+            deadline
+        )
+    if response.usage is not None:
+        metrics.LLM_TOKENS.inc(response.usage.prompt_tokens, helper=helper, kind='prompt')
+        metrics.LLM_TOKENS.inc(response.usage.completion_tokens, helper=helper, kind='completion')
+    return response.choices[0].message.content or ''
+
+
+def stream_chat_completion(messages, max_tokens, temperature, deadline=None, helper='chat'):
+    """Yield content deltas of a streamed chat completion.
+
+    Only opening the stream is retried; once content has been yielded a
+    failure propagates to the caller. The upstream slot is held until the
+    stream is exhausted or closed. Token usage is not reported for streams.
+    """
+    with _observed(helper), limiter.slot(deadline):
+        stream = _call(
+            lambda timeout: get_client().chat.completions.create(
+                model=MODEL,
+                messages=messages,
+                max_tokens=max_tokens,
+                temperature=temperature,
+                timeout=timeout,
+                stream=True
+            ),
+            deadline
+        )
+        try:
+            for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception:
+            breaker.record_failure()
+            raise
+        finally:
+            stream.response.close()
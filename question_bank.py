@@ -0,0 +1,253 @@
+"""Persistent bank of generated interview questions.
+
+Every question the model generates is stored here, keyed by normalized
+skill, question type and difficulty. When the bank can fill a full
+3 technical + 2 behavioral set from the requested skills, it is served without
+a model call. Least-served questions are picked first, so
+repeat users rotate through the bank instead of seeing the same set.
+
+Pre-warm the bank for the most common skills with:
+
+    python question_bank.py warm [--top 20] [--skills "Python,SQL"] [--difficulty intermediate]
+"""
+import argparse
+import hashlib
+import random
+import time
+
+import storage
+
+TECHNICAL_PER_SET = 3
+BEHAVIORAL_PER_SET = 2
+DIFFICULTIES = ('beginner', 'intermediate', 'advanced')
+
+# A skill counts as covered once it has this many technical questions at a
+# difficulty; only covered skills fill technical slots, so rotation has depth
+MIN_DEPTH = 3
+
+
+def create_table(conn):
+    """Create the bank table and its lookup index on an open connection"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS question_bank (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            question_hash TEXT NOT NULL UNIQUE,
+            question TEXT NOT NULL,
+            type TEXT NOT NULL,
+            skill TEXT NOT NULL,
+            skill_key TEXT NOT NULL,
+            difficulty TEXT NOT NULL,
+            served_count INTEGER NOT NULL DEFAULT 0,
+            last_served_at REAL NOT NULL DEFAULT 0,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_question_bank_lookup
+        ON question_bank (skill_key, type, difficulty, served_count, last_served_at)
+    ''')
+    conn.execute('''
+        CREATE INDEX IF NOT EXISTS idx_question_bank_type
+        ON question_bank (type, difficulty, served_count, last_served_at)
+    ''')
+
+
+def normalize_skill(skill):
+    return ' '.join(str(skill).lower().split())
+
+
+def normalize_difficulty(difficulty):
+    difficulty = normalize_skill(difficulty or '')
+    return difficulty if difficulty in DIFFICULTIES else 'intermediate'
+
+
+def _question_hash(question):
+    return hashlib.sha256(' '.join(question.lower().split()).encode('utf-8')).hexdigest()
+
+
+def add_questions(questions, difficulty):
+    """Store generated questions; duplicates of existing questions are ignored"""
+    difficulty = normalize_difficulty(difficulty)
+    now = time.time()
+    rows = []
+    for item in questions:
+        if not isinstance(item, dict) or not item.get('question'):
+            continue
+        question = str(item['question']).strip()
+        question_type = normalize_skill(item.get('type') or 'technical')
+        skill = str(item.get('skill') or 'General').strip()
+        rows.append((
+            _question_hash(question), question, question_type, skill,
+            normalize_skill(skill), difficulty, now
+        ))
+    if not rows:
+        return 0
+
+    def insert(conn):
+        before = conn.total_changes
+        conn.executemany('''
+            INSERT OR IGNORE INTO question_bank
+                (question_hash, question, type, skill, skill_key, difficulty, created_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        return conn.total_changes - before
+    return storage.write(insert)
+
+
+def _placeholders(values):
+    return ', '.join('?' for _ in values)
+
+
+def _candidates(conn, question_type, difficulty, skill_keys, per_skill, limit=-1):
+    """Least-served questions of a type, at most per_skill for each skill and
+    at most limit in total (-1 for no limit)"""
+    skill_filter = f'AND skill_key IN ({_placeholders(skill_keys)})' if skill_keys else ''
+    return conn.execute(f'''
+        SELECT id, question, type, skill, skill_key, depth FROM (
+            SELECT id, question, type, skill, skill_key, served_count, last_served_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY skill_key ORDER BY served_count, last_served_at, random()
+                   ) AS rank,
+                   COUNT(*) OVER (PARTITION BY skill_key) AS depth
+            FROM question_bank
+            WHERE type = ? AND difficulty = ? {skill_filter}
+        )
+        WHERE rank <= ?
+        ORDER BY served_count, last_served_at, random()
+        LIMIT ?
+    ''', (question_type, difficulty, *skill_keys, per_skill, limit)).fetchall()
+
+
+def _round_robin(rows, order, count):
+    """Pick up to count rows, cycling through skills in the requested order"""
+    by_skill = {}
+    for row in rows:
+        by_skill.setdefault(row[4], []).append(row)
+    queues = [by_skill[key] for key in order if key in by_skill]
+    picked = []
+    while queues and len(picked) < count:
+        for queue in list(queues):
+            picked.append(queue.pop(0))
+            if not queue:
+                queues.remove(queue)
+            if len(picked) == count:
+                break
+    return picked
+
+
+def pick_questions(skills, difficulty):
+    """Assemble a question set from the bank.
+
+    Returns (questions, uncovered_skills): up to 3 technical questions taken
+    in turn from the covered skills, up to 2 behavioral ones, and the requested
+    skills that lack enough technical questions in the bank. Skill lists mix in
+    soft skills that never get technical questions, so the set counts as
+    complete once the slots are filled, not once every skill is covered.
+    """
+    difficulty = normalize_difficulty(difficulty)
+    order = []
+    names = {}
+    for skill in skills:
+        key = normalize_skill(skill)
+        if key and key not in names:
+            order.append(key)
+            names[key] = skill
+
+    with storage.connection() as conn:
+        technical = _candidates(conn, 'technical', difficulty, order, TECHNICAL_PER_SET) if order else []
+        behavioral = _candidates(conn, 'behavioral', difficulty, order, BEHAVIORAL_PER_SET) if order else []
+        random.shuffle(behavioral)
+        if len(behavioral) < BEHAVIORAL_PER_SET:
+            # Least-served ones for any skill, enough to make up the rest after duplicates
+            behavioral += _candidates(
+                conn, 'behavioral', difficulty, [], BEHAVIORAL_PER_SET, BEHAVIORAL_PER_SET + len(behavioral)
+            )
+
+    covered = {row[4] for row in technical if row[5] >= MIN_DEPTH}
+    uncovered = [names[key] for key in order if key not in covered]
+
+    picked = _round_robin([row for row in technical if row[4] in covered], order, TECHNICAL_PER_SET)
+    seen = set()
+    for row in behavioral:
+        if row[0] not in seen and len(seen) < BEHAVIORAL_PER_SET:
+            picked.append(row)
+            seen.add(row[0])
+
+    return [
+        {'id': row[0], 'question': row[1], 'type': row[2], 'skill': row[3]}
+        for row in picked
+    ], uncovered
+
+
+def mark_served(question_ids):
+    """Push served questions to the back of the rotation"""
+    if not question_ids:
+        return
+    ids = list(question_ids)
+    storage.write(lambda conn: conn.execute(
+        f'''
+        UPDATE question_bank
+        SET served_count = served_count + 1, last_served_at = ?
+        WHERE id IN ({_placeholders(ids)})
+        ''',
+        (time.time(), *ids)
+    ))
+
+
+def coverage(skill, difficulty):
+    """Number of technical questions banked for a skill at a difficulty"""
+    with storage.connection() as conn:
+        return conn.execute('''
+            SELECT COUNT(*) FROM question_bank
+            WHERE skill_key = ? AND type = 'technical' AND difficulty = ?
+        ''', (normalize_skill(skill), normalize_difficulty(difficulty))).fetchone()[0]
+
+
+def common_skills(limit):
+    """Most frequently practiced skills, falling back to the built-in skill list"""
+    with storage.connection() as conn:
+        rows = conn.execute(storage.SELECT_TOP_SKILL_STATS, (limit,)).fetchall()
+    if rows:
+        return [row[0] for row in rows]
+    from fallback import TECH_SKILLS
+    return [skill.title() for skill in TECH_SKILLS][:limit]
+
+
+def warm(skills, difficulties, generate, max_attempts=3):
+    """Generate questions until every (skill, difficulty) reaches MIN_DEPTH"""
+    for difficulty in difficulties:
+        for skill in skills:
+            for _ in range(max_attempts):
+                depth = coverage(skill, difficulty)
+                if depth >= MIN_DEPTH:
+                    break
+                try:
+                    questions = generate(f"Role requiring strong {skill} skills.", [skill], difficulty)
+                except Exception as e:
+                    print(f"Error warming {skill} ({difficulty}): {e}")
+                    break
+                if not add_questions(questions, difficulty):
+                    break
+            print(f"{skill} ({difficulty}): {coverage(skill, difficulty)} technical questions banked")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Question bank maintenance')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+    warm_parser = subcommands.add_parser('warm', help='pre-generate questions for common skills')
+    warm_parser.add_argument('--top', type=int, default=20, help='number of most common skills to warm')
+    warm_parser.add_argument('--skills', help='comma-separated skills to warm instead of the most common')
+    warm_parser.add_argument('--difficulty', choices=DIFFICULTIES + ('all',), default='all')
+    args = parser.parse_args()
+
+    # Imported here so the module stays importable from app.py
+    import app
+
+    app.init_db()
+    skills = [s.strip() for s in args.skills.split(',') if s.strip()] if args.skills else common_skills(args.top)
+    difficulties = DIFFICULTIES if args.difficulty == 'all' else (args.difficulty,)
+    warm(skills, difficulties, app._generate_questions_with_model)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""Encoders for streaming session exports.
+
+Each encoder takes the row batches yielded by storage.iter_sessions and
+yields one bytes chunk per batch, so a response built from them never holds
+more than a batch in memory.
+"""
+import csv
+import io
+import json
+import zlib
+
+from storage import DIMENSIONS
+
+CSV_COLUMNS = (
+    'session_id', 'created_at', 'status', 'position', 'question', 'type', 'skill', 'answer',
+    *DIMENSIONS, 'feedback', 'job_description'
+)
+
+
+def _decode_evaluation(value):
+    try:
+        decoded = json.loads(value) if value else None
+    except ValueError:
+        return None
+    return decoded if isinstance(decoded, dict) else None
+
+
+def session_record(row):
+    """Turn a session row and its question rows into the exported dict"""
+    session_id, job_description, status, created_at, items = row
+    return {
+        'id': session_id,
+        'created_at': created_at,
+        'status': status,
+        'job_description': job_description,
+        'questions': [
+            {'question': question, 'type': question_type, 'skill': skill}
+            for _, question, question_type, skill, _, _ in items
+        ],
+        'answers': [answer for *_, answer, _ in items],
+        'scores': [_decode_evaluation(evaluation) for *_, evaluation in items]
+    }
+
+
+def ndjson(batches):
+    """One JSON object per session per line"""
+    for rows in batches:
+        yield ''.join(json.dumps(session_record(row)) + '\n' for row in rows).encode('utf-8')
+
+
+def _csv_lines(record):
+    questions, answers, scores = record['questions'], record['answers'], record['scores']
+    # A session without questions still gets a row
+    for position in range(max(len(questions), 1)):
+        question = questions[position] if position < len(questions) else {}
+        score = scores[position] if position < len(scores) else {}
+        score = score if isinstance(score, dict) else {}
+        yield [
+            record['id'], record['created_at'], record['status'], position if questions else '',
+            question.get('question') or '', question.get('type') or '', question.get('skill') or '',
+            (answers[position] if position < len(answers) else None) or '',
+            *(score.get(dimension, '') for dimension in DIMENSIONS),
+            score.get('feedback', ''), record['job_description']
+        ]
+
+
+def csv_rows(batches):
+    """A header, then one row per question with its answer and scores"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(CSV_COLUMNS)
+    for rows in batches:
+        for row in rows:
+            writer.writerows(_csv_lines(session_record(row)))
+        yield buffer.getvalue().encode('utf-8')
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there are no sessions
+    if buffer.tell():
+        yield buffer.getvalue().encode('utf-8')
+
+
+def gzipped(chunks, level=6):
+    """Compress a chunk stream as one gzip member, flushing after every chunk
+    so the client receives data as each batch is read"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        data = compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        if data:
+            yield data
+    yield compressor.flush()
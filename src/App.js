@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { BrowserRouter as Router, Routes, Route, Navigate } from 'react-router-dom';
 import axios from 'axios';
 import Header from './components/Header';
@@ -12,6 +12,30 @@ import { Brain, Target, Award, Users } from 'lucide-react';
 // axios.defaults.baseURL = 'http://localhost:5000';
 axios.defaults.baseURL = 'https://igebra-mceb.onrender.com';
 
+// Zero-score evaluation for skipped questions, consistent with backend schema
+const SKIPPED_EVALUATION = {
+  overall_score: 0,
+  technical_accuracy: 0,
+  communication_clarity: 0,
+  depth_of_knowledge: 0,
+  contextual_understanding: 0,
+  problem_solving: 0,
+  feedback: 'Question skipped. No score awarded.',
+  strengths: [],
+  improvements: ['Provide an answer to receive feedback and a score.']
+};
+
+// Longest single long-poll for an evaluation job, in seconds
+const JOB_WAIT_SECONDS = 25;
+
+// localStorage key of the in-progress session to resume after a reload
+const ACTIVE_SESSION_KEY = 'activeSessionId';
+
+const newInterviewId = () =>
+  (window.crypto && window.crypto.randomUUID)
+    ? window.crypto.randomUUID()
+    : `${Date.now()}-${Math.random().toString(36).slice(2)}`;
+
 function App() {
   const [currentStep, setCurrentStep] = useState('input');
   const [jobDescription, setJobDescription] = useState('');
@@ -22,12 +46,44 @@ function App() {
   const [evaluations, setEvaluations] = useState([]);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState('');
+  // Evaluation jobs queued as answers come in, keyed by question index
+  const interviewId = useRef(newInterviewId());
+  const evaluationJobs = useRef({});
+  // Server-side session, written to as each answer comes in
+  const sessionId = useRef(null);
 
   // Debug useEffect to monitor state changes
   useEffect(() => {
     console.log('Current question index changed to:', currentQuestionIndex);
   }, [currentQuestionIndex]);
 
+  // Resume an interview left in progress (e.g. after a reload)
+  useEffect(() => {
+    const savedId = window.localStorage.getItem(ACTIVE_SESSION_KEY);
+    if (!savedId) {
+      return;
+    }
+    axios.get(`/api/sessions/${savedId}`).then((response) => {
+      const session = response.data.session;
+      if (session.status !== 'in_progress' || !session.questions.length) {
+        window.localStorage.removeItem(ACTIVE_SESSION_KEY);
+        return;
+      }
+      // With every question answered, reopen the last one so submitting it finishes the interview
+      const index = session.next_position !== null ? session.next_position : session.questions.length - 1;
+      sessionId.current = session.id;
+      interviewId.current = `session-${session.id}`;
+      setJobDescription(session.job_description);
+      setQuestions(session.questions.map(({ question, type, skill }) => ({ question, type, skill })));
+      setAnswers(session.questions.slice(0, index).map((item) => item.answer || ''));
+      setCurrentQuestionIndex(index);
+      setCurrentStep('interview');
+    }).catch((err) => {
+      window.localStorage.removeItem(ACTIVE_SESSION_KEY);
+      console.error('Error resuming session:', err);
+    });
+  }, []);
+
   const handleJobDescriptionSubmit = async (description) => {
     setIsLoading(true);
     setError('');
@@ -59,6 +115,9 @@ function App() {
         difficulty: difficulty
       });
       
+      interviewId.current = newInterviewId();
+      evaluationJobs.current = {};
+      await startSession(response.data.questions);
       setQuestions(response.data.questions);
       setCurrentStep('interview');
     } catch (err) {
@@ -69,92 +128,133 @@ function App() {
     }
   };
 
-  const submitAnswer = async (answer) => {
-    setIsLoading(true);
-    setError('');
-    
+  // Create the server-side session; without one the interview is saved in one request at the end
+  const startSession = async (sessionQuestions) => {
+    sessionId.current = null;
     try {
-      const currentQuestion = questions[currentQuestionIndex];
-      const response = await axios.post('/api/evaluate-answer', {
-        question: currentQuestion.question,
-        answer: answer,
-        job_context: jobDescription
+      const response = await axios.post('/api/sessions', {
+        job_description: jobDescription,
+        questions: sessionQuestions
       });
-      
-      const newAnswers = [...answers, answer];
-      const newEvaluations = [...evaluations, response.data.evaluation];
-      
-      setAnswers(newAnswers);
-      setEvaluations(newEvaluations);
-      
-      if (currentQuestionIndex < questions.length - 1) {
-        setCurrentQuestionIndex(currentQuestionIndex + 1);
-      } else {
-        // Interview completed
-        await saveSession(newAnswers, newEvaluations);
-        setCurrentStep('results');
-      }
+      sessionId.current = response.data.session_id;
+      interviewId.current = `session-${sessionId.current}`;
+      window.localStorage.setItem(ACTIVE_SESSION_KEY, String(sessionId.current));
     } catch (err) {
-      setError('Failed to evaluate answer. Please try again.');
-      console.error('Error evaluating answer:', err);
-    } finally {
-      setIsLoading(false);
+      console.error('Error starting session:', err);
+    }
+  };
+
+  const recordAnswer = (index, fields) => {
+    if (!sessionId.current) {
+      return Promise.resolve();
+    }
+    return axios.put(`/api/sessions/${sessionId.current}/answers/${index}`, fields);
+  };
+
+  // Queue an evaluation; resubmitting the same answer returns the same job
+  const queueEvaluation = (index, answer) => {
+    const job = axios.post('/api/evaluation-jobs', {
+      session_id: interviewId.current,
+      question: questions[index].question,
+      answer: answer,
+      job_context: jobDescription
+    }).then((response) => response.data.job);
+    // Let finishInterview retry a failed submission
+    job.catch(() => {
+      if (evaluationJobs.current[index] === job) {
+        delete evaluationJobs.current[index];
+      }
+    });
+    evaluationJobs.current[index] = job;
+    return job;
+  };
+
+  const waitForEvaluation = async (index, answer) => {
+    let job = await (evaluationJobs.current[index] || queueEvaluation(index, answer));
+    while (job.status !== 'done') {
+      const response = await axios.get(`/api/evaluation-jobs/${job.id}`, {
+        params: { wait: JOB_WAIT_SECONDS }
+      });
+      job = response.data.job;
+    }
+    return job.evaluation;
+  };
+
+  const submitAnswer = async (answer) => {
+    const newAnswers = [...answers, answer];
+    setAnswers(newAnswers);
+    recordAnswer(newAnswers.length - 1, { answer }).catch((err) => {
+      console.error('Error saving answer:', err);
+    });
+    if (answer) {
+      // Evaluated in the background while the next question is answered
+      queueEvaluation(newAnswers.length - 1, answer).catch((err) => {
+        console.error('Error queueing evaluation:', err);
+      });
+    }
+    
+    if (currentQuestionIndex < questions.length - 1) {
+      setCurrentQuestionIndex(currentQuestionIndex + 1);
+    } else {
+      // Interview completed
+      await finishInterview(newAnswers);
     }
   };
 
   const skipCurrentQuestion = async () => {
+    console.log('Skip button clicked! Current question index:', currentQuestionIndex);
+    console.log('Total questions:', questions.length);
+    await submitAnswer('');
+  };
+
+  const finishInterview = async (sessionAnswers) => {
+    setIsLoading(true);
+    setError('');
+    
     try {
-      console.log('Skip button clicked! Current question index:', currentQuestionIndex);
-      console.log('Total questions:', questions.length);
+      // Collect the evaluations queued while answering; skipped ones score zero
+      const newEvaluations = await Promise.all(sessionAnswers.map((answer, index) => (
+        answer ? waitForEvaluation(index, answer) : SKIPPED_EVALUATION
+      )));
       
-      // Create a zero-score evaluation object consistent with backend schema
-      const zeroEval = {
-        overall_score: 0,
-        technical_accuracy: 0,
-        communication_clarity: 0,
-        depth_of_knowledge: 0,
-        contextual_understanding: 0,
-        problem_solving: 0,
-        feedback: 'Question skipped. No score awarded.',
-        strengths: [],
-        improvements: ['Provide an answer to receive feedback and a score.']
-      };
-
-      const newAnswers = [...answers, ''];
-      const newEvaluations = [...evaluations, zeroEval];
-
-      setAnswers(newAnswers);
       setEvaluations(newEvaluations);
-
-      if (currentQuestionIndex < questions.length - 1) {
-        console.log('Moving to next question...');
-        setCurrentQuestionIndex(currentQuestionIndex + 1);
-      } else {
-        console.log('Interview completed, moving to results...');
-        // Interview completed
-        await saveSession(newAnswers, newEvaluations);
-        setCurrentStep('results');
-      }
+      await saveSession(sessionAnswers, newEvaluations);
+      setCurrentStep('results');
     } catch (err) {
-      console.error('Error skipping question:', err);
-      setError('Failed to skip question. Please try again.');
+      // Drop the last answer so resubmitting it retries the evaluation
+      setAnswers(sessionAnswers.slice(0, -1));
+      setError('Failed to evaluate answers. Please try again.');
+      console.error('Error evaluating answers:', err);
+    } finally {
+      setIsLoading(false);
     }
   };
 
   const saveSession = async (sessionAnswers, sessionEvaluations) => {
     try {
-      await axios.post('/api/save-session', {
-        job_description: jobDescription,
-        questions: questions,
-        answers: sessionAnswers,
-        scores: sessionEvaluations
-      });
+      if (sessionId.current) {
+        // Answers are already stored; add the evaluations and close the session
+        await Promise.all(sessionEvaluations.map((evaluation, index) => (
+          recordAnswer(index, { answer: sessionAnswers[index], evaluation })
+        )));
+        await axios.post(`/api/sessions/${sessionId.current}/finalize`);
+      } else {
+        await axios.post('/api/save-session', {
+          job_description: jobDescription,
+          questions: questions,
+          answers: sessionAnswers,
+          scores: sessionEvaluations
+        });
+      }
+      window.localStorage.removeItem(ACTIVE_SESSION_KEY);
     } catch (err) {
       console.error('Error saving session:', err);
     }
   };
 
   const resetSession = () => {
+    sessionId.current = null;
+    window.localStorage.removeItem(ACTIVE_SESSION_KEY);
     setCurrentStep('input');
     setJobDescription('');
     setExtractedSkills([]);
@@ -1,20 +1,32 @@
 import React, { useState, useEffect } from 'react';
 import axios from 'axios';
-import { History, Calendar, TrendingUp, BarChart3 } from 'lucide-react';
+import { History, Calendar, TrendingUp, BarChart3, Download, Search, X } from 'lucide-react';
 
 const Dashboard = ({ onStartNew }) => {
   const [sessions, setSessions] = useState([]);
+  const [totalSessions, setTotalSessions] = useState(0);
+  const [nextCursor, setNextCursor] = useState(null);
   const [loading, setLoading] = useState(true);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [error, setError] = useState('');
+  const [query, setQuery] = useState('');
+  // null while browsing; search results replace the session list otherwise
+  const [searchResults, setSearchResults] = useState(null);
+  const [searchTotal, setSearchTotal] = useState(0);
+  const [searchOffset, setSearchOffset] = useState(null);
 
   useEffect(() => {
     fetchSessions();
   }, []);
 
-  const fetchSessions = async () => {
+  const fetchSessions = async (cursor = null) => {
     try {
-      const response = await axios.get('/api/sessions');
-      setSessions(response.data.sessions);
+      const response = await axios.get('/api/sessions', {
+        params: cursor ? { cursor } : {}
+      });
+      setSessions((previous) => (cursor ? [...previous, ...response.data.sessions] : response.data.sessions));
+      setTotalSessions(response.data.total);
+      setNextCursor(response.data.next_cursor);
     } catch (err) {
       setError('Failed to load sessions');
       console.error('Error fetching sessions:', err);
@@ -23,6 +35,40 @@ const Dashboard = ({ onStartNew }) => {
     }
   };
 
+  const loadMoreSessions = async () => {
+    setLoadingMore(true);
+    await fetchSessions(nextCursor);
+    setLoadingMore(false);
+  };
+
+  const searchSessions = async (offset = 0) => {
+    if (!query.trim()) {
+      setSearchResults(null);
+      return;
+    }
+    setLoadingMore(true);
+    setError('');
+    try {
+      const response = await axios.get('/api/sessions/search', {
+        params: { q: query, offset }
+      });
+      setSearchResults((previous) => (offset ? [...previous, ...response.data.results] : response.data.results));
+      setSearchTotal(response.data.total);
+      setSearchOffset(response.data.next_offset);
+    } catch (err) {
+      setError('Failed to search sessions');
+      console.error('Error searching sessions:', err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const clearSearch = () => {
+    setQuery('');
+    setSearchResults(null);
+    setSearchOffset(null);
+  };
+
   const formatDate = (dateString) => {
     return new Date(dateString).toLocaleDateString('en-US', {
       year: 'numeric',
@@ -70,7 +116,7 @@ const Dashboard = ({ onStartNew }) => {
             <div className="w-12 h-12 bg-blue-500/20 rounded-lg flex items-center justify-center mx-auto mb-4">
               <History className="w-6 h-6 text-blue-400" />
             </div>
-            <h3 className="text-2xl font-bold text-white mb-2">{sessions.length}</h3>
+            <h3 className="text-2xl font-bold text-white mb-2">{totalSessions}</h3>
             <p className="text-white/60">Total Sessions</p>
           </div>
           
@@ -97,10 +143,21 @@ const Dashboard = ({ onStartNew }) => {
 
         {/* Sessions List */}
         <div className="glass-effect rounded-lg p-8">
-          <h2 className="text-2xl font-bold text-white mb-6 flex items-center">
-            <History className="w-6 h-6 mr-3" />
-            Recent Sessions
-          </h2>
+          <div className="flex items-center justify-between mb-6">
+            <h2 className="text-2xl font-bold text-white flex items-center">
+              <History className="w-6 h-6 mr-3" />
+              Recent Sessions
+            </h2>
+            {sessions.length > 0 && (
+              <a
+                href={`${axios.defaults.baseURL || ''}/api/sessions/export?format=csv&gzip=1`}
+                className="bg-white/10 hover:bg-white/20 text-white font-semibold py-2 px-4 rounded-lg transition-all duration-200 flex items-center"
+              >
+                <Download className="w-4 h-4 mr-2" />
+                Export CSV
+              </a>
+            )}
+          </div>
 
           {error && (
             <div className="bg-red-500/20 border border-red-400/30 rounded-lg p-4 mb-6">
@@ -108,7 +165,62 @@ const Dashboard = ({ onStartNew }) => {
             </div>
           )}
 
-          {sessions.length === 0 ? (
+          {sessions.length > 0 && (
+            <form
+              onSubmit={(event) => {
+                event.preventDefault();
+                searchSessions();
+              }}
+              className="flex items-center bg-white/5 border border-white/10 rounded-lg px-4 mb-6"
+            >
+              <Search className="w-5 h-5 text-white/60" />
+              <input
+                type="text"
+                value={query}
+                onChange={(event) => setQuery(event.target.value)}
+                placeholder='Search past sessions, e.g. kubernetes or "system design"'
+                className="flex-1 bg-transparent text-white placeholder-white/40 py-3 px-3 focus:outline-none"
+              />
+              {searchResults !== null && (
+                <button type="button" onClick={clearSearch} className="text-white/60 hover:text-white">
+                  <X className="w-5 h-5" />
+                </button>
+              )}
+            </form>
+          )}
+
+          {searchResults !== null ? (
+            <div className="space-y-4">
+              <p className="text-white/60 text-sm">
+                {searchTotal} matching session{searchTotal === 1 ? '' : 's'}
+              </p>
+              {searchResults.map((result) => (
+                <div key={result.id} className="bg-white/5 border border-white/10 rounded-lg p-6">
+                  <h3 className="text-lg font-semibold text-white mb-2">
+                    Session #{result.id}
+                  </h3>
+                  {/* Snippets are HTML-escaped by the API apart from the <mark> highlights */}
+                  <p
+                    className="text-white/70 text-sm mb-3"
+                    dangerouslySetInnerHTML={{ __html: result.snippet }}
+                  />
+                  <div className="flex items-center text-white/60 text-sm">
+                    <Calendar className="w-4 h-4 mr-2" />
+                    {formatDate(result.created_at)}
+                  </div>
+                </div>
+              ))}
+              {searchOffset !== null && (
+                <button
+                  onClick={() => searchSessions(searchOffset)}
+                  disabled={loadingMore}
+                  className="w-full text-white/70 hover:text-white py-3 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more results'}
+                </button>
+              )}
+            </div>
+          ) : sessions.length === 0 ? (
             <div className="text-center py-12">
               <div className="w-16 h-16 bg-white/10 rounded-full flex items-center justify-center mx-auto mb-4">
                 <History className="w-8 h-8 text-white/60" />
@@ -140,13 +252,28 @@ const Dashboard = ({ onStartNew }) => {
                       </div>
                     </div>
                     <div className="ml-4">
-                      <span className="px-3 py-1 bg-blue-500/20 text-blue-200 rounded-full text-sm font-medium">
-                        Completed
-                      </span>
+                      {session.status === 'in_progress' ? (
+                        <span className="px-3 py-1 bg-yellow-500/20 text-yellow-200 rounded-full text-sm font-medium">
+                          In progress
+                        </span>
+                      ) : (
+                        <span className="px-3 py-1 bg-blue-500/20 text-blue-200 rounded-full text-sm font-medium">
+                          Completed
+                        </span>
+                      )}
                     </div>
                   </div>
                 </div>
               ))}
+              {nextCursor && (
+                <button
+                  onClick={loadMoreSessions}
+                  disabled={loadingMore}
+                  className="w-full text-white/70 hover:text-white py-3 transition-colors disabled:opacity-50"
+                >
+                  {loadingMore ? 'Loading...' : 'Load more sessions'}
+                </button>
+              )}
             </div>
           )}
         </div>
@@ -0,0 +1,905 @@
+"""SQLite storage layer.
+
+Connections come from a small shared pool instead of being opened per
+request. Every connection runs in WAL mode with a busy timeout so readers
+never block writers and concurrent writers wait instead of failing with
+"database is locked". Statements are kept as module constants so sqlite3's
+per-connection statement cache reuses their prepared form.
+
+Sessions are written incrementally: start_session stores the questions,
+record_answer updates one question's row as each answer or evaluation
+arrives, and finalize_session folds the scores into the dashboard summaries
+once. The questions/answers/scores JSON columns of sessions are only read
+for rows saved before that.
+"""
+import json
+import os
+import queue
+import re
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import metrics
+
+DB_PATH = os.getenv('DATABASE_PATH', 'interview_prep.db')
+POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 8))
+BUSY_TIMEOUT_MS = int(os.getenv('DB_BUSY_TIMEOUT_MS', 5000))
+WRITE_BATCHING = os.getenv('DB_WRITE_BATCHING', '').lower() in ('1', 'true', 'yes')
+# A search term found in more documents (job descriptions, questions with
+# their answers) than this is ranked among its newest matches only, so BM25
+# scoring cost stays flat as history grows
+SEARCH_RANK_WINDOW = int(os.getenv('SEARCH_RANK_WINDOW', 10000))
+
+PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -16000',
+    'PRAGMA temp_store = MEMORY',
+    f'PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}',
+    'PRAGMA foreign_keys = ON',
+)
+
+SCHEMA = (
+    '''
+    CREATE TABLE IF NOT EXISTS sessions (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        job_description TEXT,
+        questions TEXT,
+        answers TEXT,
+        scores TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_sessions_created_at ON sessions (created_at, id)',
+    # Row count kept by triggers so listing never has to COUNT(*) the table
+    '''
+    CREATE TABLE IF NOT EXISTS session_count (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        total INTEGER NOT NULL
+    )
+    ''',
+    'INSERT OR IGNORE INTO session_count (id, total) SELECT 1, COUNT(*) FROM sessions',
+    '''
+    CREATE TRIGGER IF NOT EXISTS sessions_count_insert AFTER INSERT ON sessions
+    BEGIN
+        UPDATE session_count SET total = total + 1 WHERE id = 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS sessions_count_delete AFTER DELETE ON sessions
+    BEGIN
+        UPDATE session_count SET total = total - 1 WHERE id = 1;
+    END
+    ''',
+    # One row per question of a session
+    '''
+    CREATE TABLE IF NOT EXISTS session_questions (
+        session_id INTEGER NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+        position INTEGER NOT NULL,
+        question TEXT,
+        type TEXT,
+        skill TEXT,
+        skill_key TEXT,
+        answer TEXT,
+        day TEXT NOT NULL,
+        PRIMARY KEY (session_id, position)
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_session_questions_skill ON session_questions (skill_key, day)',
+    'CREATE INDEX IF NOT EXISTS idx_session_questions_type ON session_questions (type, day)',
+    'CREATE INDEX IF NOT EXISTS idx_session_questions_day ON session_questions (day)',
+    # One row per scored dimension of each answer
+    '''
+    CREATE TABLE IF NOT EXISTS session_scores (
+        session_id INTEGER NOT NULL,
+        position INTEGER NOT NULL,
+        dimension TEXT NOT NULL,
+        score REAL NOT NULL,
+        day TEXT NOT NULL,
+        PRIMARY KEY (session_id, position, dimension),
+        FOREIGN KEY (session_id, position)
+            REFERENCES session_questions (session_id, position) ON DELETE CASCADE
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_session_scores_dimension ON session_scores (dimension, day)',
+    # Running totals updated on every save, so dashboard aggregates never scan history
+    '''
+    CREATE TABLE IF NOT EXISTS skill_stats (
+        skill_key TEXT PRIMARY KEY,
+        skill TEXT NOT NULL,
+        answers INTEGER NOT NULL,
+        score_sum REAL NOT NULL
+    )
+    ''',
+    'CREATE INDEX IF NOT EXISTS idx_skill_stats_answers ON skill_stats (answers)',
+    '''
+    CREATE TABLE IF NOT EXISTS dimension_stats (
+        dimension TEXT PRIMARY KEY,
+        answers INTEGER NOT NULL,
+        score_sum REAL NOT NULL
+    )
+    ''',
+    '''
+    CREATE TABLE IF NOT EXISTS daily_stats (
+        day TEXT NOT NULL,
+        dimension TEXT NOT NULL,
+        answers INTEGER NOT NULL,
+        score_sum REAL NOT NULL,
+        PRIMARY KEY (day, dimension)
+    )
+    ''',
+    # Full-text index with one document per job description and one per
+    # question and its answer, so saving an answer re-indexes only that row.
+    # rowid = (session id << 16) + position + 1, with 0 for the job
+    # description: documents of a session are contiguous and rowid order is
+    # session order.
+    '''
+    CREATE VIRTUAL TABLE IF NOT EXISTS session_text USING fts5 (
+        job_description, question, answer,
+        tokenize = 'porter unicode61'
+    )
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_insert AFTER INSERT ON sessions
+    BEGIN
+        INSERT INTO session_text (rowid, job_description) VALUES (new.id << 16, new.job_description);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_update AFTER UPDATE OF job_description ON sessions
+    BEGIN
+        UPDATE session_text SET job_description = new.job_description WHERE rowid = new.id << 16;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_delete AFTER DELETE ON sessions
+    BEGIN
+        DELETE FROM session_text WHERE rowid BETWEEN old.id << 16 AND (old.id << 16) + 65535;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_question_insert AFTER INSERT ON session_questions
+    BEGIN
+        INSERT INTO session_text (rowid, question, answer)
+        VALUES ((new.session_id << 16) + new.position + 1, new.question, new.answer);
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_question_update AFTER UPDATE OF question, answer ON session_questions
+    BEGIN
+        UPDATE session_text SET question = new.question, answer = new.answer
+        WHERE rowid = (new.session_id << 16) + new.position + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS session_text_question_delete AFTER DELETE ON session_questions
+    BEGIN
+        DELETE FROM session_text WHERE rowid = (old.session_id << 16) + old.position + 1;
+    END
+    ''',
+)
+
+# Columns added to existing tables; init_db adds whichever are missing
+COLUMNS = (
+    ('sessions', 'status', "TEXT NOT NULL DEFAULT 'completed'"),
+    ('sessions', 'finalized_at', 'TIMESTAMP'),
+    ('session_questions', 'evaluation', 'TEXT'),
+)
+
+DIMENSIONS = (
+    'overall_score',
+    'technical_accuracy',
+    'communication_clarity',
+    'depth_of_knowledge',
+    'contextual_understanding',
+    'problem_solving',
+)
+
+INSERT_SESSION = '''
+    INSERT INTO sessions (job_description, questions, answers, scores)
+    VALUES (?, ?, ?, ?)
+'''
+INSERT_SESSION_STARTED = "INSERT INTO sessions (job_description, status) VALUES (?, 'in_progress')"
+SELECT_SESSION_POSITION = '''
+    SELECT s.status, q.day FROM session_questions AS q
+    JOIN sessions AS s ON s.id = q.session_id
+    WHERE q.session_id = ? AND q.position = ?
+'''
+UPDATE_SESSION_ANSWER = 'UPDATE session_questions SET answer = ? WHERE session_id = ? AND position = ?'
+UPDATE_SESSION_EVALUATION = 'UPDATE session_questions SET evaluation = ? WHERE session_id = ? AND position = ?'
+DELETE_SESSION_SCORES = 'DELETE FROM session_scores WHERE session_id = ? AND position = ?'
+FINALIZE_SESSION = '''
+    UPDATE sessions SET status = 'completed', finalized_at = CURRENT_TIMESTAMP
+    WHERE id = ? AND status = 'in_progress'
+'''
+SELECT_SESSION_SCORES = '''
+    SELECT q.skill, q.skill_key, sc.dimension, sc.score, sc.day FROM session_scores AS sc
+    JOIN session_questions AS q ON q.session_id = sc.session_id AND q.position = sc.position
+    WHERE sc.session_id = ?
+'''
+SELECT_SESSION = 'SELECT id, job_description, status, created_at, finalized_at FROM sessions WHERE id = ?'
+SELECT_SESSION_QUESTIONS = '''
+    SELECT position, question, type, skill, answer, evaluation FROM session_questions
+    WHERE session_id = ?
+    ORDER BY position
+'''
+INSERT_SESSION_QUESTION = '''
+    INSERT INTO session_questions (session_id, position, question, type, skill, skill_key, answer, day)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+INSERT_SESSION_SCORE = '''
+    INSERT INTO session_scores (session_id, position, dimension, score, day)
+    VALUES (?, ?, ?, ?, ?)
+'''
+UPSERT_SKILL_STATS = '''
+    INSERT INTO skill_stats (skill_key, skill, answers, score_sum) VALUES (?, ?, 1, ?)
+    ON CONFLICT (skill_key) DO UPDATE SET
+        answers = answers + 1,
+        score_sum = score_sum + excluded.score_sum
+'''
+UPSERT_DIMENSION_STATS = '''
+    INSERT INTO dimension_stats (dimension, answers, score_sum) VALUES (?, 1, ?)
+    ON CONFLICT (dimension) DO UPDATE SET
+        answers = answers + 1,
+        score_sum = score_sum + excluded.score_sum
+'''
+UPSERT_DAILY_STATS = '''
+    INSERT INTO daily_stats (day, dimension, answers, score_sum) VALUES (?, ?, 1, ?)
+    ON CONFLICT (day, dimension) DO UPDATE SET
+        answers = answers + 1,
+        score_sum = score_sum + excluded.score_sum
+'''
+
+# Listing reads only the columns it returns and truncates in SQL, so the large
+# questions/answers/scores blobs are never loaded
+SESSION_SUMMARY_COLUMNS = '''
+    SELECT id,
+           CASE WHEN length(job_description) > 100
+                THEN substr(job_description, 1, 100) || '...'
+                ELSE job_description END,
+           created_at,
+           status
+    FROM sessions
+'''
+SELECT_SESSIONS_PAGE = SESSION_SUMMARY_COLUMNS + '''
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+'''
+SELECT_SESSIONS_PAGE_AFTER = SESSION_SUMMARY_COLUMNS + '''
+    WHERE (created_at, id) < (?, ?)
+    ORDER BY created_at DESC, id DESC
+    LIMIT ?
+'''
+# Export walks sessions oldest first in keyset batches over the created_at index
+SELECT_SESSIONS_EXPORT = '''
+    SELECT id, job_description, status, created_at FROM sessions
+    WHERE created_at >= ? AND created_at < ? AND (created_at, id) > (?, ?)
+    ORDER BY created_at, id
+    LIMIT ?
+'''
+SELECT_EXPORT_QUESTIONS = '''
+    SELECT session_id, position, question, type, skill, answer, evaluation FROM session_questions
+    WHERE session_id BETWEEN ? AND ?
+    ORDER BY session_id, position
+'''
+SELECT_SESSION_COUNT = 'SELECT total FROM session_count WHERE id = 1'
+# Ranks and pages sessions by their best-matching document inside the FTS
+# index; snippets are made for the page rows only
+SEARCH_SESSIONS = '''
+    SELECT s.id, s.created_at, hits.rowid, hits.score FROM (
+        SELECT rowid >> 16 AS session_id, rowid, min(rank) AS score
+        FROM session_text
+        WHERE session_text MATCH ? AND rowid >= ?
+        GROUP BY rowid >> 16
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    ) AS hits
+    JOIN sessions AS s ON s.id = hits.session_id
+    ORDER BY hits.score
+'''
+# One pass over the page's rowid range; +rowid keeps the IN list out of the
+# FTS lookup, which would otherwise re-run the query (and re-expand prefix
+# terms) once per row. \x02/\x03 mark matched terms in the snippet; callers
+# turn them into markup.
+SEARCH_SNIPPETS = '''
+    SELECT rowid, snippet(session_text, -1, char(2), char(3), '...', 16) FROM session_text
+    WHERE session_text MATCH ? AND rowid BETWEEN ? AND ? AND +rowid IN ({})
+'''
+COUNT_SEARCH_MATCHES = 'SELECT COUNT(DISTINCT rowid >> 16) FROM session_text WHERE session_text MATCH ?'
+# Walking the doclist in rowid order is cheap; this finds the oldest document
+# inside the rank window
+SEARCH_WINDOW_FLOOR = '''
+    SELECT rowid FROM session_text WHERE session_text MATCH ?
+    ORDER BY rowid DESC
+    LIMIT 1 OFFSET ?
+'''
+COUNT_RANKED_MATCHES = '''
+    SELECT COUNT(DISTINCT rowid >> 16) FROM session_text WHERE session_text MATCH ? AND rowid >= ?
+'''
+# Several terms may be spread over a session's documents: a session matches
+# when every term matches one of them. One of these per term, joined with
+# INTERSECT, gives the matching sessions.
+SEARCH_TERM_SESSIONS = 'SELECT rowid >> 16 FROM session_text WHERE session_text MATCH ? AND rowid >= ?'
+COUNT_ALL_TERMS = 'SELECT COUNT(*) FROM ({})'
+# Ranks the matching sessions by their best document for any of the terms
+SEARCH_ALL_TERMS = '''
+    SELECT s.id, s.created_at, hits.rowid, hits.score FROM (
+        SELECT rowid >> 16 AS session_id, rowid, min(rank) AS score
+        FROM session_text
+        WHERE session_text MATCH ? AND rowid >= ? AND rowid >> 16 IN ({})
+        GROUP BY rowid >> 16
+        ORDER BY score
+        LIMIT ? OFFSET ?
+    ) AS hits
+    JOIN sessions AS s ON s.id = hits.session_id
+    ORDER BY hits.score
+'''
+SELECT_DIMENSION_STATS = 'SELECT dimension, answers, score_sum FROM dimension_stats'
+SELECT_TOP_SKILL_STATS = '''
+    SELECT skill, answers, score_sum FROM skill_stats
+    ORDER BY answers DESC
+    LIMIT ?
+'''
+SELECT_DAILY_STATS = '''
+    SELECT day, answers, score_sum FROM daily_stats
+    WHERE dimension = 'overall_score' AND day >= ?
+    ORDER BY day
+'''
+
+
+def _connect(path):
+    # Autocommit mode: transactions are opened explicitly by transaction()
+    conn = sqlite3.connect(
+        path,
+        timeout=BUSY_TIMEOUT_MS / 1000,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=256
+    )
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+class ConnectionPool:
+    """A bounded LIFO pool of SQLite connections shared across threads"""
+
+    def __init__(self, path, size):
+        self.path = path
+        self.size = size
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+        if create:
+            try:
+                return _connect(self.path)
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+        return self._idle.get()
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        self._idle.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+
+_pool = ConnectionPool(DB_PATH, POOL_SIZE)
+
+
+def configure(path=DB_PATH, pool_size=POOL_SIZE):
+    """Point the storage layer at a different database file"""
+    global _pool, _batcher
+    _pool.close()
+    _pool = ConnectionPool(path, pool_size)
+    _batcher = None
+
+
+@contextmanager
+def _borrow(kind):
+    started = time.perf_counter()
+    conn = _pool.acquire()
+    acquired = time.perf_counter()
+    metrics.DB_POOL_WAIT_SECONDS.observe(acquired - started)
+    try:
+        yield conn
+    finally:
+        _pool.release(conn)
+        metrics.DB_SECONDS.observe(time.perf_counter() - acquired, kind=kind)
+
+
+@contextmanager
+def connection():
+    """Borrow a pooled connection for reads or single statements"""
+    with _borrow('connection') as conn:
+        yield conn
+
+
+@contextmanager
+def transaction():
+    """Run a short write transaction, taking the write lock up front"""
+    with _borrow('transaction') as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+
+
+def init_db(*extra_schema):
+    """Create tables and apply pending migrations.
+
+    Callers can pass extra DDL callables taking a connection.
+    """
+    with transaction() as conn:
+        for statement in SCHEMA:
+            conn.execute(statement)
+        for table, column, declaration in COLUMNS:
+            existing = {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+            if column not in existing:
+                conn.execute(f'ALTER TABLE {table} ADD COLUMN {column} {declaration}')
+        for create in extra_schema:
+            create(conn)
+        version = conn.execute('PRAGMA user_version').fetchone()[0]
+        for target, migrate in enumerate(MIGRATIONS[version:], start=version + 1):
+            migrate(conn)
+            conn.execute(f'PRAGMA user_version = {target}')
+
+
+def _migrate_normalize_sessions(conn):
+    """Backfill per-question/per-score rows and summaries for existing sessions"""
+    rows = conn.execute('''
+        SELECT id, questions, answers, scores, date(created_at) FROM sessions
+        WHERE id NOT IN (SELECT DISTINCT session_id FROM session_questions)
+        ORDER BY id
+    ''')
+    for session_id, questions, answers, scores, day in rows.fetchall():
+        try:
+            decoded = [json.loads(value) if value else [] for value in (questions, answers, scores)]
+        except ValueError:
+            print(f"Skipping session {session_id}: invalid JSON")
+            continue
+        _index_session(conn, session_id, *decoded, day or _today())
+
+
+def _migrate_question_evaluations(conn):
+    """Copy each saved evaluation from the scores JSON onto its question row"""
+    conn.execute('''
+        UPDATE session_questions SET evaluation = (
+            SELECT json_extract(s.scores, '$[' || session_questions.position || ']')
+            FROM sessions AS s
+            WHERE s.id = session_questions.session_id
+              AND json_valid(s.scores)
+              AND json_type(s.scores, '$[' || session_questions.position || ']') = 'object'
+        )
+        WHERE evaluation IS NULL
+    ''')
+
+
+def _migrate_session_text(conn):
+    """Build the full-text index: one document per job description and one per
+    question row. Drops the session_search table of earlier builds."""
+    for trigger in ('insert', 'update', 'delete', 'question_insert', 'question_update', 'question_delete'):
+        conn.execute(f'DROP TRIGGER IF EXISTS session_search_{trigger}')
+    conn.execute('DROP TABLE IF EXISTS session_search')
+    conn.execute('DELETE FROM session_text')
+    conn.execute('INSERT INTO session_text (rowid, job_description) SELECT id << 16, job_description FROM sessions')
+    conn.execute('''
+        INSERT INTO session_text (rowid, question, answer)
+        SELECT (session_id << 16) + position + 1, question, answer FROM session_questions
+    ''')
+
+
+# Applied in order, one per schema change; PRAGMA user_version records how
+# many have run
+MIGRATIONS = (
+    _migrate_normalize_sessions,
+    _migrate_question_evaluations,
+    _migrate_session_text,
+)
+
+
+class WriteBatcher:
+    """Coalesces bursts of small writes into one commit (group commit).
+
+    submit() takes a callable that writes through the given connection and
+    returns a Future for its result, so callers still get e.g. their row id
+    back; they just share the commit with whatever else queued up while the
+    previous batch was being written (plus an optional max_delay). Each write
+    runs in its own savepoint so one failure does not sink the batch.
+    """
+
+    def __init__(self, max_batch=64, max_delay=0.0):
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='db-write-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, write):
+        future = Future()
+        self._queue.put((write, future))
+        return future
+
+    def _next_batch(self):
+        # Everything that queued up during the previous commit goes in this one
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    batch.append(self._queue.get(timeout=remaining))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            outcomes = []
+            try:
+                with transaction() as conn:
+                    for write, _ in batch:
+                        conn.execute('SAVEPOINT batched_write')
+                        try:
+                            outcomes.append((True, write(conn)))
+                            conn.execute('RELEASE batched_write')
+                        except Exception as e:
+                            conn.execute('ROLLBACK TO batched_write')
+                            conn.execute('RELEASE batched_write')
+                            outcomes.append((False, e))
+            except Exception as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            for (_, future), (ok, value) in zip(batch, outcomes):
+                if ok:
+                    future.set_result(value)
+                else:
+                    future.set_exception(value)
+
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+
+def _get_batcher():
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = WriteBatcher()
+    return _batcher
+
+
+def write(func, batched=None):
+    """Run func(conn) in a write transaction, optionally through the batcher"""
+    if batched is None:
+        batched = WRITE_BATCHING
+    if batched:
+        return _get_batcher().submit(func).result()
+    with transaction() as conn:
+        return func(conn)
+
+
+def _today():
+    # Matches the UTC date of CURRENT_TIMESTAMP
+    return time.strftime('%Y-%m-%d', time.gmtime())
+
+
+def _skill_key(skill):
+    return ' '.join(skill.lower().split())
+
+
+def _is_score(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+class SessionNotFoundError(LookupError):
+    """Raised for a session id (or question position) that does not exist"""
+
+
+class SessionFinalizedError(Exception):
+    """Raised when writing answers to a session that has been finalized"""
+
+
+def _insert_questions(conn, session_id, questions, day, answers=()):
+    for position, question in enumerate(questions):
+        if not isinstance(question, dict):
+            question = {'question': str(question)}
+        skill = str(question.get('skill') or 'General')
+        answer = answers[position] if position < len(answers) else None
+        conn.execute(INSERT_SESSION_QUESTION, (
+            session_id, position, question.get('question'), str(question.get('type') or '').lower() or None,
+            skill, _skill_key(skill), answer if isinstance(answer, str) else None, day
+        ))
+
+
+def _record_answer(conn, session_id, position, answer, evaluation, day):
+    """Store one answer and/or evaluation; None leaves that field unchanged"""
+    if isinstance(answer, str):
+        conn.execute(UPDATE_SESSION_ANSWER, (answer, session_id, position))
+    if isinstance(evaluation, dict):
+        conn.execute(UPDATE_SESSION_EVALUATION, (json.dumps(evaluation), session_id, position))
+        conn.execute(DELETE_SESSION_SCORES, (session_id, position))
+        conn.executemany(INSERT_SESSION_SCORE, [
+            (session_id, position, dimension, evaluation[dimension], day)
+            for dimension in DIMENSIONS if _is_score(evaluation.get(dimension))
+        ])
+
+
+def _fold_into_stats(conn, session_id):
+    """Add a finished session's scores to the running summaries"""
+    for skill, skill_key, dimension, score, day in conn.execute(SELECT_SESSION_SCORES, (session_id,)).fetchall():
+        conn.execute(UPSERT_DIMENSION_STATS, (dimension, score))
+        conn.execute(UPSERT_DAILY_STATS, (day, dimension, score))
+        if dimension == 'overall_score':
+            conn.execute(UPSERT_SKILL_STATS, (skill_key, skill, score))
+
+
+def _index_session(conn, session_id, questions, answers, scores, day):
+    """Write normalized rows for a whole session and fold its scores into the summaries"""
+    if not isinstance(questions, list):
+        return
+    answers = answers if isinstance(answers, list) else []
+    scores = scores if isinstance(scores, list) else []
+    _insert_questions(conn, session_id, questions, day, answers)
+    for position, score in enumerate(scores[:len(questions)]):
+        _record_answer(conn, session_id, position, None, score, day)
+    _fold_into_stats(conn, session_id)
+
+
+def start_session(job_description, questions):
+    """Create an in-progress session with its questions and return its id"""
+    def write_session(conn):
+        session_id = conn.execute(INSERT_SESSION_STARTED, (job_description,)).lastrowid
+        _insert_questions(conn, session_id, questions, _today())
+        return session_id
+    return write(write_session)
+
+
+def record_answer(session_id, position, answer=None, evaluation=None):
+    """Store the answer and/or evaluation for one question of an in-progress
+    session. Only that question's row and its score rows are written."""
+    def write_answer(conn):
+        row = conn.execute(SELECT_SESSION_POSITION, (session_id, position)).fetchone()
+        if row is None:
+            raise SessionNotFoundError(f"Session {session_id} has no question {position}")
+        status, day = row
+        if status != 'in_progress':
+            raise SessionFinalizedError(f"Session {session_id} is already {status}")
+        _record_answer(conn, session_id, position, answer, evaluation, day)
+    write(write_answer)
+
+
+def finalize_session(session_id):
+    """Mark a session completed and fold its scores into the summaries.
+    Finalizing a completed session again changes nothing."""
+    def write_finalize(conn):
+        if conn.execute(FINALIZE_SESSION, (session_id,)).rowcount:
+            _fold_into_stats(conn, session_id)
+        elif conn.execute(SELECT_SESSION, (session_id,)).fetchone() is None:
+            raise SessionNotFoundError(f"Session {session_id} does not exist")
+    write(write_finalize)
+
+
+def get_session(session_id):
+    """Return a session with its questions, answers and evaluations, or None"""
+    with connection() as conn:
+        session = conn.execute(SELECT_SESSION, (session_id,)).fetchone()
+        if session is None:
+            return None
+        rows = conn.execute(SELECT_SESSION_QUESTIONS, (session_id,)).fetchall()
+    questions = [
+        {
+            'position': position,
+            'question': question,
+            'type': question_type,
+            'skill': skill,
+            'answer': answer,
+            'evaluation': json.loads(evaluation) if evaluation else None
+        }
+        for position, question, question_type, skill, answer, evaluation in rows
+    ]
+    unanswered = [item['position'] for item in questions if item['answer'] is None]
+    return {
+        'id': session[0],
+        'job_description': session[1],
+        'status': session[2],
+        'created_at': session[3],
+        'finalized_at': session[4],
+        'questions': questions,
+        'next_position': unanswered[0] if unanswered else None
+    }
+
+
+def save_session(job_description, questions, answers, scores, batched=None):
+    """Store a finished session in one write and return its id.
+
+    Kept for clients that post the whole session at the end; it goes through
+    the same rows as start_session/record_answer/finalize_session.
+    """
+    return write(lambda conn: _write_session(conn, job_description, questions, answers, scores), batched)
+
+
+def _write_session(conn, job_description, questions, answers, scores):
+    session_id = conn.execute(INSERT_SESSION_STARTED, (job_description,)).lastrowid
+    _index_session(conn, session_id, questions, answers, scores, _today())
+    conn.execute(FINALIZE_SESSION, (session_id,))
+    return session_id
+
+
+def list_sessions(limit, after=None):
+    """Return up to limit (id, job_description, created_at, status) rows, newest first.
+
+    after is the (created_at, id) of the last row of the previous page.
+    """
+    with connection() as conn:
+        if after is None:
+            return conn.execute(SELECT_SESSIONS_PAGE, (limit,)).fetchall()
+        return conn.execute(SELECT_SESSIONS_PAGE_AFTER, (*after, limit)).fetchall()
+
+
+def iter_sessions(start='', end='9999-12-31', batch_size=500):
+    """Yield lists of up to batch_size sessions, oldest first, as
+    (id, job_description, status, created_at, questions) where questions are
+    (position, question, type, skill, answer, evaluation JSON) rows.
+
+    start and end bound created_at (end exclusive). Each batch borrows a
+    pooled connection only while it is read and the next one resumes after
+    the last (created_at, id), so an export never pins a connection or an
+    open read transaction between batches.
+    """
+    after = ('', 0)
+    while True:
+        with connection() as conn:
+            rows = conn.execute(SELECT_SESSIONS_EXPORT, (start, end, *after, batch_size)).fetchall()
+            ids = [row[0] for row in rows]
+            questions = {session_id: [] for session_id in ids}
+            if ids:
+                for session_id, *question in conn.execute(SELECT_EXPORT_QUESTIONS, (min(ids), max(ids))):
+                    if session_id in questions:
+                        questions[session_id].append(tuple(question))
+        if rows:
+            yield [(*row, questions[row[0]]) for row in rows]
+        if len(rows) < batch_size:
+            return
+        after = (rows[-1][3], rows[-1][0])
+
+
+def fts_query(text):
+    """Turn free text into an FTS5 query matching every term.
+
+    Words become quoted terms (so FTS5 operators and punctuation in user
+    input are inert), "double quoted" text stays a phrase, and a trailing *
+    keeps prefix matching. Returns None if there is nothing to search for.
+    """
+    terms = []
+    for token in re.findall(r'"[^"]*"|[^\s"]+', text or ''):
+        prefix = token.endswith('*') and not token.startswith('"')
+        words = re.findall(r'\w+', token.strip('"*'))
+        if words:
+            terms.append('"' + ' '.join(words) + '"' + ('*' if prefix else ''))
+    return ' '.join(terms) or None
+
+
+def _search_all_terms(conn, terms, limit, offset):
+    """Page through sessions where every term matches at least one of their
+    documents; returns (hits, total, ranked, query for the snippets)"""
+    matched = ' INTERSECT '.join([SEARCH_TERM_SESSIONS] * len(terms))
+    count = COUNT_ALL_TERMS.format(matched)
+    total = conn.execute(count, [value for term in terms for value in (term, 0)]).fetchone()[0]
+    ranked = total
+    # Rank among the newest sessions holding no more than SEARCH_RANK_WINDOW
+    # documents of any one term
+    floor = 0
+    for term in terms:
+        window_start = conn.execute(SEARCH_WINDOW_FLOOR, (term, SEARCH_RANK_WINDOW - 1)).fetchone()
+        if window_start is not None:
+            floor = max(floor, window_start[0] >> 16 << 16)
+    bounded = [value for term in terms for value in (term, floor)]
+    if floor:
+        ranked = conn.execute(count, bounded).fetchone()[0]
+    either = ' OR '.join(terms)
+    hits = conn.execute(SEARCH_ALL_TERMS.format(matched), (either, floor, *bounded, limit, offset)).fetchall()
+    return hits, total, ranked, either
+
+
+def search_sessions(query, limit, offset=0):
+    """BM25-ranked sessions matching an fts_query() query.
+
+    Returns (rows, total, ranked): rows are (id, created_at, snippet, score),
+    total counts every matching session and ranked how many of them (the
+    newest, covering about SEARCH_RANK_WINDOW documents matching each term)
+    can be paged through. Each term must appear in the job description or in
+    one of the questions and answers, not necessarily the same one.
+    """
+    terms = re.findall(r'"[^"]*"\*?', query)
+    with connection() as conn:
+        if len(terms) > 1:
+            hits, total, ranked, query = _search_all_terms(conn, terms, limit, offset)
+        else:
+            total = conn.execute(COUNT_SEARCH_MATCHES, (query,)).fetchone()[0]
+            ranked = total
+            window_start = conn.execute(SEARCH_WINDOW_FLOOR, (query, SEARCH_RANK_WINDOW - 1)).fetchone()
+            floor = 0
+            if window_start is not None:
+                # Start at a session boundary so a session is ranked on all of its documents
+                floor = window_start[0] >> 16 << 16
+                ranked = conn.execute(COUNT_RANKED_MATCHES, (query, floor)).fetchone()[0]
+            hits = conn.execute(SEARCH_SESSIONS, (query, floor, limit, offset)).fetchall()
+        snippets = {}
+        if hits:
+            rowids = [hit[2] for hit in hits]
+            snippets = dict(conn.execute(
+                SEARCH_SNIPPETS.format(', '.join('?' for _ in rowids)),
+                (query, min(rowids), max(rowids), *rowids)
+            ).fetchall())
+    rows = [(session_id, created_at, snippets.get(rowid), score) for session_id, created_at, rowid, score in hits]
+    return rows, total, ranked
+
+
+def count_sessions():
+    """Return the total number of stored sessions"""
+    with connection() as conn:
+        row = conn.execute(SELECT_SESSION_COUNT).fetchone()
+        return row[0] if row else 0
+
+
+def _average(answers, score_sum):
+    return round(score_sum / answers, 2) if answers else None
+
+
+def get_stats(top_skills=20, days=30):
+    """Dashboard aggregates read from the summary tables"""
+    since = time.strftime('%Y-%m-%d', time.gmtime(time.time() - days * 86400))
+    with connection() as conn:
+        total_sessions = conn.execute(SELECT_SESSION_COUNT).fetchone()
+        dimensions = conn.execute(SELECT_DIMENSION_STATS).fetchall()
+        skills = conn.execute(SELECT_TOP_SKILL_STATS, (top_skills,)).fetchall()
+        daily = conn.execute(SELECT_DAILY_STATS, (since,)).fetchall()
+    return {
+        'total_sessions': total_sessions[0] if total_sessions else 0,
+        'dimensions': {
+            dimension: {'answers': answers, 'average': _average(answers, score_sum)}
+            for dimension, answers, score_sum in dimensions
+        },
+        'skills': [
+            {'skill': skill, 'answers': answers, 'average': _average(answers, score_sum)}
+            for skill, answers, score_sum in skills
+        ],
+        'daily': [
+            {'day': day, 'answers': answers, 'average': _average(answers, score_sum)}
+            for day, answers, score_sum in daily
+        ]
+    }
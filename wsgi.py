@@ -0,0 +1,31 @@
+"""Production entry point.
+
+Runs the Flask app on gevent: the standard library is monkey-patched before
+anything else is imported, so the blocking model calls in llm_client (and the
+evaluation thread pool) yield to other requests while they wait on the
+network. One worker process can then hold hundreds of sessions open at once;
+llm_client's limiter bounds how many of them reach the model concurrently.
+
+Importing the app does no database work; schema setup starts on a background
+greenlet once the worker has loaded, so /api/health answers immediately and
+other requests wait only for whatever setup is left.
+
+    gunicorn --worker-class gevent wsgi:app   # see Procfile
+    python wsgi.py                            # single process, no gunicorn
+"""
+from gevent import monkey
+
+monkey.patch_all()
+
+import os  # noqa: E402
+
+from app import app, start_db_init  # noqa: E402,F401
+
+start_db_init()
+
+if __name__ == "__main__":
+    from gevent.pywsgi import WSGIServer
+
+    port = int(os.environ.get("PORT", 5000))
+    print(f"Serving on http://0.0.0.0:{port}")
+    WSGIServer(("0.0.0.0", port), app).serve_forever()